@@ -1,5 +1,4 @@
 from app import create_app, db
-from app.seeds import seed_data
 
 app = create_app()
 
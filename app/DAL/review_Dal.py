@@ -1,40 +1,267 @@
-from app.config.connector import db
-from app.models.reviewModel import Review
+from app.config.connector import db, cache, review_search_index
+from app.models.reviewModel import Review, UserRatingStats
+from app.models.userRoleModel import User
+from app.utils.bulk_insert import insert_in_chunks
+from app.utils.pagination import keyset_page
+from app.utils.replica import read_from_primary
+from collections import Counter, defaultdict
 from datetime import datetime
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload
 
 class ReviewDAL:
     @staticmethod
-    def create_review(content, user_id):
-        review = Review(content=content, user_id=user_id, created_at=datetime.now())
+    def create_review(content, user_id, rating=None):
+        review = Review(content=content, user_id=user_id, rating=rating, created_at=datetime.now())
         db.session.add(review)
+        if rating is not None:
+            ReviewDAL._apply_rating_deltas({user_id: {rating: 1}})
         db.session.commit()
+        review_search_index.add(review.id, review.content)
         return review
 
+    @staticmethod
+    def _apply_rating_deltas(deltas):
+        """
+        Add {user_id: {rating: change}} to user_rating_stats inside the caller's transaction.
+        Updates are relative (col = col + n) so concurrent writers don't lose increments.
+        """
+        for user_id, changes in deltas.items():
+            changes = {rating: change for rating, change in changes.items() if change}
+            if not changes:
+                continue
+            count = sum(changes.values())
+            total = sum(rating * change for rating, change in changes.items())
+            values = {
+                'rating_count': UserRatingStats.rating_count + count,
+                'rating_sum': UserRatingStats.rating_sum + total,
+            }
+            for rating, change in changes.items():
+                values[f'count_{rating}'] = getattr(UserRatingStats, f'count_{rating}') + change
+            stmt = (
+                db.update(UserRatingStats)
+                .where(UserRatingStats.user_id == user_id)
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            if db.session.execute(stmt).rowcount:
+                continue
+            stats = UserRatingStats(user_id=user_id, rating_count=count, rating_sum=total,
+                                    **{f'count_{rating}': change for rating, change in changes.items()})
+            try:
+                with db.session.begin_nested():
+                    db.session.add(stats)
+            except IntegrityError:
+                # Another transaction created the row first
+                db.session.execute(stmt)
+
+    @staticmethod
+    def get_rating_summary(user_id):
+        return db.session.get(UserRatingStats, user_id)
+
+    @staticmethod
+    def bulk_create_reviews(rows, chunk_size):
+        """
+        Insert many reviews with executemany, chunk_size rows per transaction.
+        `rows` is a list of (index, content, user_id, rating) that already passed validation.
+        Returns (inserted_count, errors) where errors is a list of {'index', 'message'}.
+        """
+        errors = []
+        user_ids = {row[2] for row in rows}
+        known_ids = set(db.session.scalars(db.select(User.id).where(User.id.in_(user_ids)))) if user_ids else set()
+
+        valid = []
+        for row in rows:
+            if row[2] in known_ids:
+                valid.append(row)
+            else:
+                errors.append({'index': row[0], 'message': f'User {row[2]} does not exist'})
+
+        now = datetime.now()
+
+        def insert(chunk, errors):
+            db.session.execute(
+                db.insert(Review),
+                [{'content': content, 'user_id': user_id, 'rating': rating, 'created_at': now}
+                 for _, content, user_id, rating in chunk]
+            )
+            deltas = defaultdict(Counter)
+            for _, _, user_id, rating in chunk:
+                if rating is not None:
+                    deltas[user_id][rating] += 1
+            ReviewDAL._apply_rating_deltas(deltas)
+            return len(chunk)
+
+        inserted, insert_errors = insert_in_chunks(valid, chunk_size, insert)
+        if inserted:
+            # executemany gives us no ids; the fallback index rebuilds on its next search
+            review_search_index.invalidate()
+        return inserted, errors + insert_errors
+
+    @staticmethod
+    def _with_author(query):
+        # Review.to_dict reads review.user, so load authors in the same SELECT instead of one per row
+        return query.options(joinedload(Review.user))
+
     @staticmethod
     def get_review_by_id(review_id):
-        return db.session.get(Review, review_id)
+        return db.session.get(Review, review_id, options=[joinedload(Review.user)])
+
+    @staticmethod
+    def get_review_data(review_id, version):
+        """
+        Serialized review, served from the cache when possible. `version` identifies the row
+        versions the review is built from (see get_review_version) and is part of the cache key,
+        so after a write in any process the old entry is never served again.
+        """
+        def load():
+            with read_from_primary():
+                review = ReviewDAL.get_review_by_id(review_id)
+                return review.to_dict() if review else None
+        return cache.get_or_load('reviews', [review_id, version], load)
+
+    @staticmethod
+    def _filter_user_reviews(query, user_id, since, until):
+        query = query.filter(Review.user_id == user_id)
+        if since:
+            query = query.filter(Review.created_at >= since)
+        if until:
+            query = query.filter(Review.created_at < until)
+        return query
+
+    @staticmethod
+    def get_reviews_by_user_id(user_id, limit, after=None, since=None, until=None):
+        """
+        Return one page of a user's reviews ordered by (created_at, id), optionally limited to
+        created_at in [since, until), and the cursor for the next page.
+        """
+        query = ReviewDAL._filter_user_reviews(Review.query, user_id, since, until)
+        return keyset_page(ReviewDAL._with_author(query), Review.created_at, Review.id, limit, after)
 
     @staticmethod
-    def get_reviews_by_user_id(user_id):
-        return Review.query.filter_by(user_id=user_id).all()
+    def get_user_review_rows(user_id, limit, after=None, since=None, until=None):
+        """
+        Same page as get_reviews_by_user_id, as REVIEW_ROW_COLUMNS tuples.
+        """
+        query = ReviewDAL._filter_user_reviews(ReviewDAL._row_query(), user_id, since, until)
+        return keyset_page(query, Review.created_at, Review.id, limit, after)
 
     @staticmethod
-    def update_review(review_id, new_content):
+    def _version_query():
+        # Only the columns a review's JSON can change with: its own row and its author's
+        return (
+            db.session.query(Review.id, Review.created_at, Review.updated_at,
+                             User.updated_at.label('author_updated_at'))
+            .join(User, Review.user_id == User.id)
+        )
+
+    @staticmethod
+    def get_review_version(review_id):
+        return ReviewDAL._version_query().filter(Review.id == review_id).first()
+
+    @staticmethod
+    def list_review_versions(limit, after=None):
+        """
+        Same page as list_reviews, but only (id, updated_at, author_updated_at) per row.
+        """
+        return keyset_page(ReviewDAL._version_query(), Review.created_at, Review.id, limit, after)
+
+    @staticmethod
+    def get_user_review_versions(user_id, limit, after=None, since=None, until=None):
+        """
+        Same page as get_reviews_by_user_id, but only (id, updated_at, author_updated_at) per row.
+        """
+        query = ReviewDAL._filter_user_reviews(ReviewDAL._version_query(), user_id, since, until)
+        return keyset_page(query, Review.created_at, Review.id, limit, after)
+
+    @staticmethod
+    def update_review(review_id, new_content=None, new_rating=None, clear_rating=False):
         review = db.session.get(Review, review_id)
         if review:
-            review.content = new_content
+            if new_content:
+                review.content = new_content
+            if clear_rating:
+                new_rating = None
+            if (clear_rating or new_rating is not None) and new_rating != review.rating:
+                changes = Counter()
+                if new_rating is not None:
+                    changes[new_rating] += 1
+                if review.rating is not None:
+                    changes[review.rating] -= 1
+                ReviewDAL._apply_rating_deltas({review.user_id: changes})
+                review.rating = new_rating
             db.session.commit()
+            if new_content:
+                review_search_index.add(review_id, new_content)
         return review
 
     @staticmethod
     def delete_review(review_id):
         review = db.session.get(Review, review_id)
         if review:
+            if review.rating is not None:
+                ReviewDAL._apply_rating_deltas({review.user_id: {review.rating: -1}})
             db.session.delete(review)
             db.session.commit()
+            review_search_index.remove(review_id)
             return True
         return False
 
     @staticmethod
-    def list_reviews():
-        return Review.query.all()
+    def _row_query():
+        # Plain tuples in REVIEW_ROW_COLUMNS order, for serializing lists without ORM objects
+        return (
+            db.session.query(Review.id, Review.content, Review.rating, Review.user_id,
+                             User.username, Review.created_at)
+            .join(User, Review.user_id == User.id)
+        )
+
+    @staticmethod
+    def stream_review_rows(batch_size):
+        """
+        Yield every review as a REVIEW_ROW_COLUMNS tuple in id order through a server-side cursor,
+        batch_size rows at a time, so memory stays flat regardless of table size.
+        """
+        query = ReviewDAL._row_query().order_by(Review.id).execution_options(yield_per=batch_size)
+        for row in query:
+            yield row
+
+    @staticmethod
+    def search_reviews(query, limit, offset=0):
+        """
+        Full-text search over review content, best matches first.
+        Returns (reviews, has_more). MySQL uses the FULLTEXT index; other databases use
+        the in-process inverted index, built from the table on first use.
+        """
+        if db.engine.dialect.name == 'mysql':
+            score = match(Review.content, against=query).in_natural_language_mode()
+            reviews = (
+                ReviewDAL._with_author(Review.query.filter(score > 0))
+                .order_by(score.desc(), Review.id.desc())
+                .offset(offset)
+                .limit(limit + 1)
+                .all()
+            )
+            return reviews[:limit], len(reviews) > limit
+
+        if not review_search_index.loaded:
+            review_search_index.build(db.session.execute(db.select(Review.id, Review.content)))
+        ids = review_search_index.search(query, limit + 1, offset)
+        found = {review.id: review for review in ReviewDAL._with_author(Review.query.filter(Review.id.in_(ids))).all()}
+        reviews = [found[review_id] for review_id in ids if review_id in found]
+        return reviews[:limit], len(ids) > limit
+
+    @staticmethod
+    def list_reviews(limit, after=None):
+        """
+        Return one page of reviews ordered by (created_at, id) and the cursor for the next page.
+        """
+        return keyset_page(ReviewDAL._with_author(Review.query), Review.created_at, Review.id, limit, after)
+
+    @staticmethod
+    def list_review_rows(limit, after=None):
+        """
+        Same page as list_reviews, as REVIEW_ROW_COLUMNS tuples.
+        """
+        return keyset_page(ReviewDAL._row_query(), Review.created_at, Review.id, limit, after)
@@ -1,5 +1,13 @@
+import time
+from flask import current_app
+from sqlalchemy.orm import make_transient_to_detached
 from app import db
+from app.config.connector import cache, identity_cache
 from app.models.userRoleModel import Role
+from app.utils.replica import read_from_primary
+
+# The roles table is tiny and rarely written, so keep a detached copy per process
+_roles_cache = {'roles': None, 'loaded_at': 0.0, 'version': None}
 
 class RoleDAL:
     @staticmethod
@@ -7,12 +15,67 @@ class RoleDAL:
         role = Role(name=name)
         db.session.add(role)
         db.session.commit()
+        RoleDAL.invalidate_roles_cache()
         return role
 
+    @staticmethod
+    def cached_roles(refresh=False, version=None):
+        """
+        Return {role_id: Role} for every role, attached to the current session without a query
+        while the cached copy is younger than ROLE_CACHE_TTL. Pass the roles table's `version`
+        (get_roles_version) to reload a copy taken before a write, e.g. by another worker.
+        """
+        expired = time.monotonic() - _roles_cache['loaded_at'] > current_app.config['ROLE_CACHE_TTL']
+        changed = version is not None and version != _roles_cache['version']
+        if refresh or expired or changed or _roles_cache['roles'] is None:
+            detached = []
+            with read_from_primary():
+                rows = db.session.execute(db.select(Role.id, Role.name)).all()
+            for role_id, name in rows:
+                role = Role(id=role_id, name=name)
+                make_transient_to_detached(role)
+                detached.append(role)
+            _roles_cache['roles'] = detached
+            _roles_cache['loaded_at'] = time.monotonic()
+            _roles_cache['version'] = version
+        return {role.id: db.session.merge(role, load=False) for role in _roles_cache['roles']}
+
+    @staticmethod
+    def invalidate_roles_cache():
+        _roles_cache['roles'] = None
+
+    @staticmethod
+    def _invalidate_role(role_id):
+        # Cached identities carry their roles
+        identity_cache.clear()
+
     @staticmethod
     def get_role_by_id(role_id):
         return db.session.get(Role, role_id)
 
+    @staticmethod
+    def get_role_data(role_id, version):
+        """
+        Serialized role, served from the cache when possible. `version` is part of the cache key,
+        like in ReviewDAL.get_review_data.
+        """
+        def load():
+            with read_from_primary():
+                role = RoleDAL.get_role_by_id(role_id)
+                return role.to_dict() if role else None
+        return cache.get_or_load('roles', [role_id, version], load)
+
+    @staticmethod
+    def get_role_version(role_id):
+        return db.session.execute(db.select(Role.updated_at).where(Role.id == role_id)).scalar()
+
+    @staticmethod
+    def get_roles_version():
+        """
+        (row count, latest updated_at) over the whole roles table.
+        """
+        return tuple(db.session.execute(db.select(db.func.count(Role.id), db.func.max(Role.updated_at))).one())
+
     @staticmethod
     def get_role_by_name(name):
         return Role.query.filter_by(name=name).first()
@@ -23,6 +86,8 @@ class RoleDAL:
         if role:
             role.name = new_name
             db.session.commit()
+            RoleDAL.invalidate_roles_cache()
+            RoleDAL._invalidate_role(role_id)
         return role
 
     @staticmethod
@@ -31,9 +96,22 @@ class RoleDAL:
         if role:
             db.session.delete(role)
             db.session.commit()
+            RoleDAL.invalidate_roles_cache()
+            RoleDAL._invalidate_role(role_id)
             return True
         return False
 
     @staticmethod
     def list_roles():
         return Role.query.all()
+
+    @staticmethod
+    def list_roles_data(version):
+        """
+        Serialized list of every role, served from the cache when possible. `version` (the roles
+        table's version) is part of the cache key.
+        """
+        def load():
+            with read_from_primary():
+                return [role.to_dict() for role in RoleDAL.list_roles()]
+        return cache.get_or_load('roles', ['all', version], load)
@@ -1,6 +1,14 @@
 from app import db
-from app.models.userRoleModel import User,Role
+from app.config.connector import cache, identity_cache, password_hasher
+from app.models.reviewModel import UserRatingStats
+from app.models.userRoleModel import User,Role, user_roles
+from app.DAL.role_Dal import RoleDAL
+from app.utils.bulk_insert import insert_in_chunks
+from app.utils.pagination import keyset_page
+from app.utils.replica import read_from_primary
+from datetime import datetime
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.attributes import set_committed_value
 
 class UserDAL:
     @staticmethod
@@ -9,10 +17,7 @@ class UserDAL:
             user = User(username=username, email=email)
             user.set_password(password)
             if roles:
-                for role_name in roles:
-                    role = Role.query.filter_by(name=role_name).first()
-                    if role:
-                        user.roles.append(role)
+                user.roles = UserDAL._roles_by_name(roles)
             db.session.add(user)
             db.session.commit()
             return user
@@ -20,10 +25,141 @@ class UserDAL:
             db.session.rollback()
             return None  # Handle unique constraint violation
 
+    @staticmethod
+    def _roles_by_name(names):
+        # One IN query for every role name; unknown names are ignored
+        return Role.query.filter(Role.name.in_(set(names))).all()
+
+    @staticmethod
+    def bulk_create_users(rows, chunk_size):
+        """
+        Create many users, chunk_size rows per transaction. One IN query resolves every role name,
+        and users and their user_roles rows are inserted with executemany.
+        `rows` is a list of (index, username, email, password, role_names) that already passed
+        validation. Rows naming an unknown role, or whose username or email is already taken
+        (in the database or by an earlier row), are reported and skipped before any hashing.
+        Returns (inserted_count, errors) where errors is a list of {'index', 'message'}.
+        """
+        errors = []
+        role_names = {name for row in rows for name in row[4]}
+        role_ids = dict(db.session.execute(
+            db.select(Role.name, Role.id).where(Role.name.in_(role_names))
+        ).all()) if role_names else {}
+
+        valid = []
+        usernames, emails = set(), set()
+        for row in rows:
+            index, username, email, _, names = row
+            unknown = [name for name in names if name not in role_ids]
+            if unknown:
+                errors.append({'index': index, 'message': f'Role {unknown[0]} does not exist'})
+            elif username in usernames:
+                errors.append({'index': index, 'message': f'Duplicate username {username}'})
+            elif email in emails:
+                errors.append({'index': index, 'message': f'Duplicate email {email}'})
+            else:
+                usernames.add(username)
+                emails.add(email)
+                valid.append(row)
+
+        def insert(chunk, errors):
+            chunk = UserDAL._skip_existing(chunk, errors)
+            if not chunk:
+                return 0
+            hashes = password_hasher.hash_many([row[3] for row in chunk])
+            now = datetime.now()
+            users = [{'username': username, 'email': email, 'password_hash': password_hash,
+                      'created_at': now, 'updated_at': now}
+                     for (_, username, email, _, _), password_hash in zip(chunk, hashes)]
+            try:
+                db.session.execute(db.insert(User), users)
+                # The role links need the new ids, so look them up by the (unique) username
+                user_ids = dict(db.session.execute(
+                    db.select(User.username, User.id).where(User.username.in_([user['username'] for user in users]))
+                ).all())
+                links = [{'user_id': user_ids[row[1]], 'role_id': role_ids[name]}
+                         for row in chunk for name in dict.fromkeys(row[4])]
+                if links:
+                    db.session.execute(user_roles.insert(), links)
+            except IntegrityError:
+                # Taken since the check, or equal to another row under the database's collation:
+                # retry the chunk row by row so only the conflicting rows are lost
+                db.session.rollback()
+                return UserDAL._insert_users_one_by_one(chunk, users, role_ids, errors)
+            return len(chunk)
+
+        inserted, insert_errors = insert_in_chunks(valid, chunk_size, insert)
+        return inserted, errors + insert_errors
+
+    @staticmethod
+    def _skip_existing(chunk, errors):
+        taken = db.session.execute(
+            db.select(User.username, User.email).where(
+                User.username.in_([row[1] for row in chunk]) | User.email.in_([row[2] for row in chunk]))
+        ).all()
+        taken_usernames = {username for username, _ in taken}
+        taken_emails = {email for _, email in taken}
+        remaining = []
+        for row in chunk:
+            if row[1] in taken_usernames:
+                errors.append({'index': row[0], 'message': f'Username {row[1]} already exists'})
+            elif row[2] in taken_emails:
+                errors.append({'index': row[0], 'message': f'Email {row[2]} already exists'})
+            else:
+                remaining.append(row)
+        return remaining
+
+    @staticmethod
+    def _insert_users_one_by_one(chunk, users, role_ids, errors):
+        inserted = 0
+        for row, user in zip(chunk, users):
+            try:
+                with db.session.begin_nested():
+                    user_id = db.session.execute(db.insert(User).values(**user)).inserted_primary_key[0]
+                    links = [{'user_id': user_id, 'role_id': role_ids[name]} for name in dict.fromkeys(row[4])]
+                    if links:
+                        db.session.execute(user_roles.insert(), links)
+                inserted += 1
+            except IntegrityError:
+                errors.append({'index': row[0], 'message': 'Username or email already exists'})
+        db.session.commit()
+        return inserted
+
     @staticmethod
     def get_user_by_id(user_id):
         return db.session.get(User, user_id)
     
+    @staticmethod
+    def get_user_data(user_id, version):
+        """
+        Serialized user, served from the cache when possible. `version` (the user's and the
+        roles table's versions) is part of the cache key, like in ReviewDAL.get_review_data.
+        """
+        def load():
+            with read_from_primary():
+                user = UserDAL.get_user_by_id(user_id)
+                return user.to_dict() if user else None
+        return cache.get_or_load('users', [user_id, version], load)
+
+    @staticmethod
+    def get_user_version(user_id):
+        """
+        (updated_at, roles count, roles' latest updated_at) in one round trip, or None when the
+        user doesn't exist. Users embed their roles, so the roles table's version is part of theirs.
+        """
+        return db.session.execute(db.select(
+            User.updated_at,
+            db.select(db.func.count(Role.id)).scalar_subquery(),
+            db.select(db.func.max(Role.updated_at)).scalar_subquery(),
+        ).where(User.id == user_id)).one_or_none()
+
+    @staticmethod
+    def list_user_versions(limit, after=None):
+        """
+        Same page as list_users, but only (id, updated_at) per row.
+        """
+        return keyset_page(db.session.query(User.id, User.updated_at), None, User.id, limit, after)
+
     @staticmethod
     def get_user_by_email(email):
         return User.query.filter_by(email=email).first()
@@ -39,23 +175,59 @@ class UserDAL:
             if new_password:
                 user.set_password(new_password)
             if new_roles:
-                user.roles.clear()  # Clear existing roles
-                for role_name in new_roles:
-                    role = Role.query.filter_by(name=role_name).first()
-                    if role:
-                        user.roles.append(role)
+                user.roles = UserDAL._roles_by_name(new_roles)
+                # Role links live in user_roles, so bump the user's version by hand
+                user.updated_at = datetime.now()
             db.session.commit()
+            identity_cache.invalidate(user_id)
         return user
 
+    @staticmethod
+    def rehash_password_if_needed(user, password):
+        """
+        Re-hash a just-verified password when PASSWORD_HASH_METHOD has changed since it was stored.
+        """
+        if user.password_needs_rehash():
+            user.set_password(password)
+            db.session.commit()
+
     @staticmethod
     def delete_user(user_id):
         user = db.session.get(User, user_id)
         if user:
+            # The rating aggregates row outlives the user's reviews and references the user
+            db.session.execute(db.delete(UserRatingStats).where(UserRatingStats.user_id == user_id))
             db.session.delete(user)
             db.session.commit()
+            identity_cache.invalidate(user_id)
             return True
         return False
 
     @staticmethod
-    def list_users():
-        return User.query.all()
+    def list_users(limit, after=None, roles_version=None):
+        """
+        Return one page of users ordered by id, with roles loaded, and the cursor for the next page.
+        `roles_version` is passed on to RoleDAL.cached_roles.
+        """
+        users, next_cursor = keyset_page(User.query, None, User.id, limit, after)
+        UserDAL._load_roles(users, roles_version)
+        return users, next_cursor
+
+    @staticmethod
+    def _load_roles(users, roles_version=None):
+        # One query on user_roles for the whole batch; the Role rows come from the cached roles table
+        if not users:
+            return
+        roles_by_user = {user.id: [] for user in users}
+        links = db.session.execute(
+            db.select(user_roles.c.user_id, user_roles.c.role_id)
+            .where(user_roles.c.user_id.in_(roles_by_user.keys()))
+        ).all()
+        roles = RoleDAL.cached_roles(version=roles_version)
+        if any(role_id not in roles for _, role_id in links):
+            roles = RoleDAL.cached_roles(refresh=True)
+        for user_id, role_id in links:
+            if role_id in roles:
+                roles_by_user[user_id].append(roles[role_id])
+        for user in users:
+            set_committed_value(user, 'roles', roles_by_user[user.id])
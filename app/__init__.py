@@ -1,61 +1,76 @@
-from flask import Flask
-from flask_migrate import Migrate
-from app.config.connector import db, migrate, jwt, login_manager  # Import extensions
+from flask import Flask, jsonify
+from app.config.connector import db, migrate, jwt, login_manager, cache, compressor, replica_router, instrumentation, identity_cache, token_blocklist, password_hasher  # Import extensions
 from app.config.config import Config
 from app.models.userRoleModel import User
-from app.seeds.seeds import seed_data
-from flasgger import Swagger
+from app.utils.api_docs import export_apispec_command, init_api_docs
+from app.utils.db_pool import configure_engines
+from app.utils.hashing import PasswordHasherBusy
+from app.utils.index_audit import audit_indexes_command
+from app.utils.json_provider import init_json_provider
+from app.utils.replica import read_from_primary
+from app.utils.startup import StartupTimer
+from app.utils.user_import import import_users_command
+from sqlalchemy.orm import selectinload
 
-def create_app():
+def create_app(config_class=Config):
+    timer = StartupTimer()
     app = Flask(__name__)
-    migrate = Migrate(app, db)
-    app.config.from_object(Config)
+    app.config.from_object(config_class)
+    init_json_provider(app)
+    configure_engines(app)
+    timer.mark('config')
     
     # Initialize extensions
     db.init_app(app)
+    replica_router.init_app(app)
+    instrumentation.init_app(app)
+    timer.mark('database')
     migrate.init_app(app, db)
     jwt.init_app(app)
     login_manager.init_app(app)
+    cache.init_app(app)
+    compressor.init_app(app)
+    identity_cache.init_app(app)
+    token_blocklist.init_app(app)
+    password_hasher.init_app(app)
+    timer.mark('extensions')
     
     
     @login_manager.user_loader
     def load_user(user_id):
-        return User.query.get(int(user_id))
+        # Served from the identity cache so authenticated requests don't query the DB
+        def load(uid):
+            with read_from_primary():
+                return db.session.get(User, uid, options=[selectinload(User.roles)])
+        return identity_cache.get_or_load(int(user_id), load)
+
+    @jwt.token_in_blocklist_loader
+    def check_if_token_revoked(jwt_header, jwt_payload):
+        identity = jwt_payload.get(app.config['JWT_IDENTITY_CLAIM'])
+        user_id = identity.get('user_id') if isinstance(identity, dict) else None
+        return token_blocklist.is_revoked(jwt_payload['jti'], jwt_payload.get('iat'), user_id)
+
+    @app.errorhandler(PasswordHasherBusy)
+    def password_hasher_busy(e):
+        return jsonify({'message': 'Server is busy, please retry shortly'}), 503, {'Retry-After': '1'}
     
     
-    Swagger(app, 
-    template={
-            "swagger": "2.0",
-            "info": {
-                "title": "RATINGS API",
-                "description": "RATINGS Restfull API made by Flask and MySQL",
-                "contact": {
-                "responsibleOrganization": "ME",
-                "responsibleDeveloper": "Me",
-                "email": "me@me.com",
-                "url": "www.me.com",
-                }
-            },
-            "securityDefinitions": {
-                "bearerAuth": {
-                    "type": "apiKey",
-                    "name": "Authorization",
-                    "in": "header",
-                    "description": "JWT Authorization header using the Bearer scheme. Example: 'Authorization: Bearer {token}'"
-                }
-            },
-            "security": [
-                {"bearerAuth": []}
-            ],
-        }
-    )
+    timer.mark('handlers')
+    init_api_docs(app)
+    timer.mark('api_docs')
     
     # Register Blueprints
-    from app.routes.api import user_bp, role_bp, auth_bp, review_bp
+    from app.routes.api import user_bp, role_bp, auth_bp, review_bp, metrics_bp
     app.register_blueprint(user_bp, url_prefix='/api/users')
     app.register_blueprint(role_bp, url_prefix='/api/roles')
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
     app.register_blueprint(review_bp, url_prefix='/api/review')
+    app.register_blueprint(metrics_bp, url_prefix='/api/metrics')
+    timer.mark('blueprints')
+
+    app.cli.add_command(audit_indexes_command)
+    app.cli.add_command(export_apispec_command)
+    app.cli.add_command(import_users_command)
     
     # Define basic routes for DB creation and seeding
     @app.route('/')
@@ -69,7 +84,11 @@ def create_app():
     
     @app.route('/create-all-seed')
     def create_seed():
+        from app.seeds.seeds import seed_data
+
         seed_data()
         return 'Database seeded successfully!'
 
+    timer.mark('routes')
+    app.extensions['startup_phases'] = timer.phases
     return app
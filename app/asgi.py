@@ -0,0 +1,233 @@
+"""
+ASGI serving mode (entry point: asgi.py, e.g. `uvicorn asgi:app`).
+
+The read endpoints in ASYNC_ENDPOINTS run on the event loop. The Flask view, the DAL and
+every hook run unchanged inside AsyncSession.run_sync. SQLAlchemy executes that code in a
+greenlet and hands each statement to the async driver (aiomysql/aiosqlite), so a request
+waiting on the database doesn't hold a thread. All other requests (writes, auth, the export)
+run the normal WSGI app on a thread pool. The WSGI app from create_app stays the default way
+to serve.
+
+Everything else such a request does runs on the event-loop thread as well, including the
+blocklist check of its token and the response cache lookup. With their redis backends each is a
+blocking round trip that holds up every other request of the worker meanwhile. (The replica
+sticky store isn't read there: the run_sync session doesn't route to the replica.)
+"""
+import asyncio
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from flask import request
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from werkzeug.exceptions import HTTPException
+from werkzeug.routing import RequestRedirect
+from app import create_app, db
+from app.config.config import Config
+from app.utils.db_pool import QUEUE_POOL_OPTIONS
+
+# Endpoints served on the event loop (GET/HEAD only)
+ASYNC_ENDPOINTS = frozenset({
+    'reviews.get_all_reviews',
+    'reviews.search_reviews',
+    'reviews.get_review_by_id',
+    'users.get_all_users',
+    'users.get_user_by_id',
+    'users.get_user_reviews',
+    'users.get_rating_summary',
+    'roles.get_all_roles',
+    'roles.get_role_by_id',
+})
+
+ASYNC_DRIVERS = {'mysql': 'mysql+aiomysql', 'sqlite': 'sqlite+aiosqlite'}
+
+# WSGI environ key carrying the run_sync session into the request
+SESSION_ENVIRON_KEY = 'ratings.async_session'
+
+
+def async_database_url(url):
+    """
+    The async-driver equivalent of a sync database URL.
+    """
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f'No async driver configured for {backend!r}; set ASYNC_DATABASE_URI')
+    return url.set(drivername=ASYNC_DRIVERS[backend])
+
+
+def uvicorn_workers():
+    """
+    The number of worker processes uvicorn was started with: its --workers option, read from
+    the command line with uvicorn's own parser (worker processes are spawned with the same
+    sys.argv), else WEB_CONCURRENCY, which uvicorn falls back to.
+    """
+    workers = None
+    # `uvicorn ...` or `python -m uvicorn ...`
+    if os.path.basename(sys.argv[0]) == 'uvicorn' or sys.argv[0].endswith(os.path.join('uvicorn', '__main__.py')):
+        from uvicorn.main import main
+        workers = main.make_context('uvicorn', sys.argv[1:]).params['workers']
+    return workers or int(os.getenv('WEB_CONCURRENCY', 1))
+
+
+def _use_async_session():
+    # Bind db.session for this request to the session run_sync handed us
+    session = request.environ.get(SESSION_ENVIRON_KEY)
+    if session is not None:
+        db.session.registry.set(session)
+
+
+def _build_environ(scope, body):
+    script_name = scope.get('root_path', '')
+    path_info = scope['path']
+    if script_name and path_info.startswith(script_name):
+        path_info = path_info[len(script_name):]
+    server_name, server_port = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': script_name.encode().decode('latin1'),
+        'PATH_INFO': path_info.encode().decode('latin1'),
+        'QUERY_STRING': scope['query_string'].decode('ascii'),
+        'SERVER_NAME': server_name,
+        'SERVER_PORT': str(server_port),
+        'SERVER_PROTOCOL': f"HTTP/{scope['http_version']}",
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    if scope.get('client'):
+        environ['REMOTE_ADDR'] = scope['client'][0]
+    for name, value in scope.get('headers', []):
+        name = name.decode('latin1').upper().replace('-', '_')
+        if name not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+            name = f'HTTP_{name}'
+        value = value.decode('latin1')
+        environ[name] = f'{environ[name]},{value}' if name in environ else value
+    # The body is read whole before the app runs, so its length is known even for a chunked
+    # upload, which has no Content-Length header and which Werkzeug would read as empty
+    environ['CONTENT_LENGTH'] = str(len(body))
+    environ.pop('HTTP_TRANSFER_ENCODING', None)
+    return environ
+
+
+class _WSGICall:
+    """
+    One call of the WSGI app. Chunks are passed to `write` as they are produced, so a
+    streamed response (the export) is never held in memory whole.
+    """
+    def __init__(self, wsgi_app, environ, write):
+        self.wsgi_app = wsgi_app
+        self.environ = environ
+        self.write = write
+        self.start = None
+
+    def start_response(self, status, headers, exc_info=None):
+        self.start = {
+            'type': 'http.response.start',
+            'status': int(status.split(' ', 1)[0]),
+            'headers': [(name.lower().encode('latin1'), value.encode('latin1')) for name, value in headers],
+        }
+
+    def __call__(self):
+        body = self.wsgi_app(self.environ, self.start_response)
+        try:
+            started = False
+            for chunk in body:
+                if not started:
+                    self.write(self.start)
+                    started = True
+                if chunk:
+                    self.write({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+            if not started:
+                self.write(self.start)
+            self.write({'type': 'http.response.body', 'body': b'', 'more_body': False})
+        finally:
+            if hasattr(body, 'close'):
+                body.close()
+
+
+class AsyncReadApp:
+    """
+    ASGI application wrapping the Flask app from create_app.
+    """
+    def __init__(self, flask_app, engine, sync_threads):
+        self.flask_app = flask_app
+        self.engine = engine
+        self.executor = ThreadPoolExecutor(sync_threads, thread_name_prefix='wsgi')
+        self.url_adapter = flask_app.url_map.bind('localhost')
+
+    def _is_async(self, scope):
+        if self.engine is None or scope['method'] not in ('GET', 'HEAD'):
+            return False
+        try:
+            endpoint, _ = self.url_adapter.match(scope['path'], method=scope['method'])
+        except (HTTPException, RequestRedirect):
+            return False
+        return endpoint in ASYNC_ENDPOINTS
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self._lifespan(receive, send)
+        if scope['type'] != 'http':
+            raise ValueError(f"Unsupported ASGI scope type {scope['type']!r}")
+
+        body = bytearray()
+        while True:
+            message = await receive()
+            body.extend(message.get('body', b''))
+            if not message.get('more_body'):
+                break
+        environ = _build_environ(scope, bytes(body))
+
+        if self._is_async(scope):
+            messages = []
+            async with AsyncSession(self.engine) as session:
+                environ[SESSION_ENVIRON_KEY] = session.sync_session
+                await session.run_sync(lambda _: _WSGICall(self.flask_app.wsgi_app, environ, messages.append)())
+            for message in messages:
+                await send(message)
+            return
+
+        loop = asyncio.get_running_loop()
+
+        def write(message):
+            asyncio.run_coroutine_threadsafe(send(message), loop).result()
+
+        await loop.run_in_executor(self.executor, _WSGICall(self.flask_app.wsgi_app, environ, write))
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                if self.engine is not None:
+                    await self.engine.dispose()
+                self.executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+
+def create_asgi_app(config_class=Config):
+    flask_app = create_app(config_class)
+    config = flask_app.config
+    engine = None
+    if config['ASGI_ASYNC_READS']:
+        url = make_url(config.get('ASYNC_DATABASE_URI') or async_database_url(config['SQLALCHEMY_DATABASE_URI']))
+        # Same pool settings as the sync engine, on the async engine's own (asyncio-aware) pool class
+        options = {key: value for key, value in config['SQLALCHEMY_ENGINE_OPTIONS'].items() if key != 'poolclass'}
+        if url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:'):
+            for name in QUEUE_POOL_OPTIONS:
+                options.pop(name, None)
+        engine = create_async_engine(url, **options)
+        instrumentation = flask_app.extensions.get('instrumentation')
+        if instrumentation is not None:
+            instrumentation.instrument_engine(engine.sync_engine, 'async')
+        flask_app.before_request(_use_async_session)
+    return AsyncReadApp(flask_app, engine, config['ASGI_SYNC_THREADS'])
+
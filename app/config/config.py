@@ -8,3 +8,104 @@ class Config:
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY')
     SQLALCHEMY_DATABASE_URI = f"mysql+pymysql://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}@{os.getenv('DB_HOST')}/{os.getenv('DB_NAME')}"
     SQLALCHEMY_TRACK_MODIFICATIONS = os.getenv('SQLALCHEMY_TRACK_MODIFICATIONS', False)
+
+    # Connection pool. Recycle connections before MySQL's wait_timeout closes them, and
+    # pre-ping so a connection dropped anyway is replaced instead of failing the request.
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 10))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 20))
+    DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', 30))
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 1800))
+    DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'true').lower() in ('1', 'true', 'yes')
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': DB_POOL_SIZE,
+        'max_overflow': DB_MAX_OVERFLOW,
+        'pool_timeout': DB_POOL_TIMEOUT,
+        'pool_recycle': DB_POOL_RECYCLE,
+        'pool_pre_ping': DB_POOL_PRE_PING,
+    }
+
+    # Optional read replica (same credentials and database name). GET requests read from it,
+    # except for a user who wrote within the last REPLICA_STICKY_SECONDS.
+    DB_REPLICA_HOST = os.getenv('DB_REPLICA_HOST')
+    SQLALCHEMY_BINDS = {
+        'replica': f"mysql+pymysql://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}@{DB_REPLICA_HOST}/{os.getenv('DB_NAME')}"
+    } if DB_REPLICA_HOST else {}
+    REPLICA_STICKY_SECONDS = int(os.getenv('REPLICA_STICKY_SECONDS', 5))
+    REPLICA_STICKY_BACKEND = os.getenv('REPLICA_STICKY_BACKEND', 'memory')
+    REPLICA_STICKY_MAX_ENTRIES = int(os.getenv('REPLICA_STICKY_MAX_ENTRIES', 100000))
+    REPLICA_STICKY_REDIS_URL = os.getenv('REPLICA_STICKY_REDIS_URL', os.getenv('CACHE_REDIS_URL', 'redis://localhost:6379/0'))
+
+    # Keyset pagination for list endpoints
+    PAGINATION_DEFAULT_LIMIT = int(os.getenv('PAGINATION_DEFAULT_LIMIT', 50))
+    PAGINATION_MAX_LIMIT = int(os.getenv('PAGINATION_MAX_LIMIT', 200))
+
+    # Seconds the in-process copy of the roles table stays valid
+    ROLE_CACHE_TTL = int(os.getenv('ROLE_CACHE_TTL', 300))
+
+    # Rows fetched per round trip by the streaming review export
+    EXPORT_BATCH_SIZE = int(os.getenv('EXPORT_BATCH_SIZE', 1000))
+
+    # Bulk review and user ingestion. Every imported user costs a password hash, so the user
+    # endpoint takes fewer rows per request; `flask import-users` has no limit
+    BULK_MAX_ROWS = int(os.getenv('BULK_MAX_ROWS', 50000))
+    BULK_USER_MAX_ROWS = int(os.getenv('BULK_USER_MAX_ROWS', 1000))
+    BULK_INSERT_CHUNK_SIZE = int(os.getenv('BULK_INSERT_CHUNK_SIZE', 1000))
+
+    # Read-through cache for DAL lookups: 'memory' (per-process LRU), 'redis' (shared) or 'none'
+    CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'memory')
+    CACHE_DEFAULT_TTL = int(os.getenv('CACHE_DEFAULT_TTL', 300))
+    CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', 10000))
+    CACHE_REDIS_URL = os.getenv('CACHE_REDIS_URL', 'redis://localhost:6379/0')
+
+    # Per-process cache behind the Flask-Login user_loader
+    IDENTITY_CACHE_TTL = int(os.getenv('IDENTITY_CACHE_TTL', 60))
+    IDENTITY_CACHE_MAX_ENTRIES = int(os.getenv('IDENTITY_CACHE_MAX_ENTRIES', 10000))
+
+    # Revoked JWTs: 'memory' (per process, refused with several workers) or 'redis' (shared by every worker)
+    JWT_BLOCKLIST_BACKEND = os.getenv('JWT_BLOCKLIST_BACKEND', 'memory')
+    JWT_BLOCKLIST_MAX_ENTRIES = int(os.getenv('JWT_BLOCKLIST_MAX_ENTRIES', 100000))
+    JWT_BLOCKLIST_MAX_PER_USER = int(os.getenv('JWT_BLOCKLIST_MAX_PER_USER', 100))
+    JWT_BLOCKLIST_REDIS_URL = os.getenv('JWT_BLOCKLIST_REDIS_URL', CACHE_REDIS_URL)
+
+    # Password hashing: any werkzeug method string, e.g. 'scrypt' or 'pbkdf2:sha256:600000'.
+    # Stored hashes made with another method are upgraded on the next successful login.
+    PASSWORD_HASH_METHOD = os.getenv('PASSWORD_HASH_METHOD', 'scrypt')
+    PASSWORD_HASH_SALT_LENGTH = int(os.getenv('PASSWORD_HASH_SALT_LENGTH', 16))
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', 2))
+    PASSWORD_HASH_MAX_PENDING = int(os.getenv('PASSWORD_HASH_MAX_PENDING', 32))
+    # Threads hashing bulk user imports (each scrypt hash holds ~32 MB while it runs)
+    PASSWORD_HASH_BULK_WORKERS = int(os.getenv('PASSWORD_HASH_BULK_WORKERS', os.cpu_count() or 2))
+
+    # `flask audit-indexes` fails on full scans of tables larger than this
+    INDEX_AUDIT_MIN_ROWS = int(os.getenv('INDEX_AUDIT_MIN_ROWS', 1000))
+
+    # Deepest offset /api/review/search will page to; ranked results can't use keyset cursors
+    SEARCH_MAX_OFFSET = int(os.getenv('SEARCH_MAX_OFFSET', 1000))
+
+    # JSON encoder: 'auto' (orjson when installed, else 'compact'), 'orjson', 'compact' or 'default'
+    JSON_PROVIDER = os.getenv('JSON_PROVIDER', 'auto')
+
+    # Prometheus-style request/SQL metrics, served per worker process on METRICS_PATH
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    METRICS_PATH = os.getenv('METRICS_PATH', '/metrics')
+    # Bearer token a scraper sends to read METRICS_PATH; without it only admin JWTs can
+    METRICS_TOKEN = os.getenv('METRICS_TOKEN')
+
+    # API docs (/apidocs, /apispec_1.json). SWAGGER_SPEC_FILE serves a spec written by
+    # `flask export-apispec` instead of parsing controller docstrings; SWAGGER_ENABLED=false skips flasgger
+    SWAGGER_ENABLED = os.getenv('SWAGGER_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    SWAGGER_SPEC_FILE = os.getenv('SWAGGER_SPEC_FILE')
+
+    # ASGI mode (asgi.py): read endpoints run on an async engine, everything else on a thread pool.
+    # ASYNC_DATABASE_URI defaults to SQLALCHEMY_DATABASE_URI with the aiomysql/aiosqlite driver.
+    ASYNC_DATABASE_URI = os.getenv('ASYNC_DATABASE_URI')
+    ASGI_ASYNC_READS = os.getenv('ASGI_ASYNC_READS', 'true').lower() in ('1', 'true', 'yes')
+    ASGI_SYNC_THREADS = int(os.getenv('ASGI_SYNC_THREADS', 32))
+
+    # Response compression: algorithms in order of preference ('br' needs the brotli package;
+    # empty disables compression), and the smallest body worth compressing
+    COMPRESS_ALGORITHMS = os.getenv('COMPRESS_ALGORITHMS', 'br,gzip')
+    COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', 1024))
+    COMPRESS_MIMETYPES = os.getenv('COMPRESS_MIMETYPES', 'application/json,application/x-ndjson')
+    COMPRESS_GZIP_LEVEL = int(os.getenv('COMPRESS_GZIP_LEVEL', 6))
+    COMPRESS_BROTLI_QUALITY = int(os.getenv('COMPRESS_BROTLI_QUALITY', 4))
@@ -1,9 +1,26 @@
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
 from flask_jwt_extended import JWTManager
 from flask_login import LoginManager
+from app.utils.cache import Cache
+from app.utils.compression import Compressor
+from app.utils.identity_cache import IdentityCache
+from app.utils.token_blocklist import TokenBlocklist
+from app.utils.hashing import PasswordHasher
+from app.utils.search import InvertedIndex
+from app.utils.metrics import Instrumentation
+from app.utils.migrate import LazyMigrate
+from app.utils.replica import ReplicaRouter, RoutingSession
 
-db = SQLAlchemy()
-migrate = Migrate()
+# Reads may go to the replica bind; see ReplicaRouter
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+migrate = LazyMigrate()
 jwt = JWTManager()
-login_manager = LoginManager()
\ No newline at end of file
+login_manager = LoginManager()
+cache = Cache()
+compressor = Compressor()
+replica_router = ReplicaRouter()
+instrumentation = Instrumentation()
+identity_cache = IdentityCache()
+token_blocklist = TokenBlocklist()
+password_hasher = PasswordHasher()
+review_search_index = InvertedIndex()
\ No newline at end of file
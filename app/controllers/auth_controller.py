@@ -1,9 +1,10 @@
 import datetime
 from flask import jsonify, request
-from flask_jwt_extended import create_access_token
+from flask_jwt_extended import create_access_token, get_jwt, get_jwt_identity, verify_jwt_in_request
 from flask_login import login_user, logout_user, current_user
 import jwt
 from app.DAL.user_Dal import UserDAL
+from app.config.connector import token_blocklist
 
 
 class AuthController:
@@ -43,17 +44,21 @@ class AuthController:
                   example: "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9..."
           401:
             description: Invalid credentials
+          503:
+            description: Too many logins being processed, retry shortly
         """
         data = request.get_json()
 
        
         user = UserDAL.get_user_by_email(data['email'])
         if user and user.check_password(data['password']):
+            UserDAL.rehash_password_if_needed(user, data['password'])
             # Log the user in with session-based authentication
             login_user(user)
             # using flask_jwt_extended    
             access_token = create_access_token(  
                 identity={'user_id': user.id, 'role': user.roles[0].name},  # Assuming user has a list of roles
+                additional_claims={'roles': user.role_names},  # Lets auth_required authorize without a DB lookup
                 expires_delta=datetime.timedelta(hours=1)  # Set token expiry time
             )
             
@@ -76,6 +81,8 @@ class AuthController:
         responses:
           200:
             description: Successfully logged out and token invalidated.
+          401:
+            description: Token invalid, expired or already revoked.
           403:
             description: Token missing.
         """
@@ -86,8 +93,10 @@ class AuthController:
         if not token:
             return jsonify({'message': 'Token is missing!'}), 403
 
-        # Add the token to the blacklist to invalidate it
-        #  blacklist.add(token)
+        # Revoke the token by its jti until it would have expired anyway
+        verify_jwt_in_request()
+        claims = get_jwt()
+        token_blocklist.revoke(claims['jti'], claims['exp'], get_jwt_identity()['user_id'])
 
         # Log out the user using Flask-Login
         logout_user()
@@ -141,7 +150,7 @@ class AuthController:
             'id': current_user.id,
             'username': current_user.username,
             'email': current_user.email,
-            'roles': [role.name for role in current_user.roles]
+            'roles': current_user.role_names
         }), 200
     
     
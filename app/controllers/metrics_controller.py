@@ -0,0 +1,36 @@
+from flask import jsonify
+from app.config.connector import db
+from app.utils.db_pool import pool_stats
+
+class MetricsController:
+    @staticmethod
+    def get_pool_stats():
+        """
+        Get database connection pool statistics
+        ---
+        tags:
+          - Metrics
+        security:
+          - bearerAuth: []
+        responses:
+          200:
+            description: Live statistics for every engine's connection pool, keyed by bind ("default" for the main database)
+            schema:
+              type: object
+              example:
+                default:
+                  pool: MonitoredQueuePool
+                  size: 10
+                  checked_out: 2
+                  checked_in: 3
+                  overflow: 0
+                  timeouts: 0
+                  wait_seconds:
+                    buckets: {"0.001": 40, "0.005": 42, "+Inf": 42}
+                    count: 42
+                    sum: 0.031
+        """
+        return jsonify({
+            bind or 'default': pool_stats(engine)
+            for bind, engine in db.engines.items()
+        }), 200
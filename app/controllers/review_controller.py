@@ -1,41 +1,203 @@
-from flask import jsonify, request
+from datetime import datetime
+from flask import Response, current_app, jsonify, request, stream_with_context
 from app.DAL.review_Dal import ReviewDAL
+from app.DAL.user_Dal import UserDAL
+from app.models.reviewModel import RATING_VALUES
+from app.utils.bulk import read_bulk_items
+from app.utils.compression import cached_json_response
+from app.utils.conditional import add_validators, latest, make_etag, not_modified
+from app.utils.pagination import parse_page_args
+from app.utils.serializers import json_list_response, review_row_json
 
 class ReviewController:
+    @staticmethod
+    def _is_valid_rating(value):
+        # Ratings are optional; when present they must be a whole number on the 1-5 scale
+        return value is None or (isinstance(value, int) and not isinstance(value, bool) and value in RATING_VALUES)
+
+    @staticmethod
+    def _page_etag(versions, next_cursor):
+        # ETag for a page, from the version rows of exactly the reviews it holds
+        return make_etag(next_cursor, *[(v.id, v.updated_at, v.author_updated_at) for v in versions])
+
     @staticmethod
     def get_all_reviews():
         """
-        Get all reviews
+        Get reviews, one page at a time
         ---
         tags:
           - Reviews
         security:
           - bearerAuth: []
+        parameters:
+          - name: limit
+            in: query
+            required: false
+            type: integer
+            description: Page size (capped by PAGINATION_MAX_LIMIT)
+            example: 50
+          - name: after
+            in: query
+            required: false
+            type: string
+            description: Cursor returned as next_cursor by the previous page
         responses:
           200:
-            description: A list of reviews
+            description: A page of reviews
             schema:
-              type: array
-              items:
-                type: object
-                properties:
-                  id:
-                    type: integer
-                    description: Review ID
-                    example: 1
-                  content:
-                    type: string
-                    description: Review content
-                    example: "Great product!"
-                  user_id:
-                    type: integer
-                    description: User ID
-                    example: 1
+              type: object
+              properties:
+                reviews:
+                  type: array
+                  items:
+                    type: object
+                    properties:
+                      id:
+                        type: integer
+                        description: Review ID
+                        example: 1
+                      content:
+                        type: string
+                        description: Review content
+                        example: "Great product!"
+                      user_id:
+                        type: integer
+                        description: User ID
+                        example: 1
+                next_cursor:
+                  type: string
+                  description: Cursor for the next page, null on the last page
+          304:
+            description: Not modified since the ETag in If-None-Match
+          400:
+            description: Invalid limit or cursor
           500:
             description: Internal Server Error
         """
-        reviews = ReviewDAL.list_reviews()
-        return jsonify([review.to_dict() for review in reviews]), 200
+        try:
+            limit, after = parse_page_args(request.args)
+        except ValueError as e:
+            return jsonify({'message': str(e)}), 400
+
+        etag = ReviewController._page_etag(*ReviewDAL.list_review_versions(limit, after))
+        cached = not_modified(etag)
+        if cached:
+            return cached
+
+        rows, next_cursor = ReviewDAL.list_review_rows(limit, after)
+        response = json_list_response('reviews', map(review_row_json, rows), next_cursor=next_cursor)
+        return add_validators(response, etag), 200
+
+    @staticmethod
+    def export_reviews():
+        """
+        Export every review as a streamed response
+        ---
+        tags:
+          - Reviews
+        security:
+          - bearerAuth: []
+        parameters:
+          - name: format
+            in: query
+            required: false
+            type: string
+            enum: [ndjson, json]
+            default: ndjson
+            description: One JSON object per line (ndjson) or a single JSON array (json)
+        produces:
+          - application/x-ndjson
+          - application/json
+        responses:
+          200:
+            description: Reviews, written incrementally as they are read from the database
+          400:
+            description: Unsupported export format
+        """
+        export_format = request.args.get('format', 'ndjson')
+        if export_format not in ('ndjson', 'json'):
+            return jsonify({'message': 'format must be ndjson or json'}), 400
+
+        batch_size = current_app.config['EXPORT_BATCH_SIZE']
+
+        def generate_ndjson():
+            for row in ReviewDAL.stream_review_rows(batch_size):
+                yield review_row_json(row) + '\n'
+
+        def generate_json_array():
+            yield '['
+            separator = ''
+            for row in ReviewDAL.stream_review_rows(batch_size):
+                yield separator + review_row_json(row)
+                separator = ','
+            yield ']'
+
+        if export_format == 'ndjson':
+            body, mimetype = generate_ndjson(), 'application/x-ndjson'
+        else:
+            body, mimetype = generate_json_array(), 'application/json'
+        return Response(stream_with_context(body), mimetype=mimetype)
+
+    @staticmethod
+    def search_reviews():
+        """
+        Search review content
+        ---
+        tags:
+          - Reviews
+        security:
+          - bearerAuth: []
+        parameters:
+          - name: q
+            in: query
+            required: true
+            type: string
+            description: Words to look for; reviews matching more of them rank higher
+            example: "great battery"
+          - name: limit
+            in: query
+            required: false
+            type: integer
+            description: Page size (capped by PAGINATION_MAX_LIMIT)
+            example: 20
+          - name: offset
+            in: query
+            required: false
+            type: integer
+            description: Number of ranked results to skip (capped by SEARCH_MAX_OFFSET)
+            example: 0
+        responses:
+          200:
+            description: Matching reviews, best match first
+            schema:
+              type: object
+              properties:
+                reviews:
+                  type: array
+                  items:
+                    type: object
+                next_offset:
+                  type: integer
+                  description: Offset of the next page, null on the last page
+          400:
+            description: Missing query or invalid paging parameters
+        """
+        query = request.args.get('q', '').strip()
+        if not query:
+            return jsonify({'message': 'Search query q is required'}), 400
+        try:
+            limit, _ = parse_page_args(request.args)
+            offset = int(request.args.get('offset', 0))
+        except ValueError as e:
+            return jsonify({'message': str(e)}), 400
+        if offset < 0 or offset > current_app.config['SEARCH_MAX_OFFSET']:
+            return jsonify({'message': f"offset must be between 0 and {current_app.config['SEARCH_MAX_OFFSET']}"}), 400
+
+        reviews, has_more = ReviewDAL.search_reviews(query, limit, offset)
+        return jsonify({
+            'reviews': [review.to_dict() for review in reviews],
+            'next_offset': offset + limit if has_more else None
+        }), 200
 
     @staticmethod
     def get_review_by_id(review_id):
@@ -71,6 +233,8 @@ class ReviewController:
                   type: integer
                   description: User ID
                   example: 1
+          304:
+            description: Not modified since the ETag in If-None-Match or the If-Modified-Since date
           404:
             description: Review not found
             schema:
@@ -80,9 +244,19 @@ class ReviewController:
                   type: string
                   example: "Review not found"
         """
-        review = ReviewDAL.get_review_by_id(review_id)
-        if review:
-            return jsonify(review.to_dict()), 200
+        version = ReviewDAL.get_review_version(review_id)
+        if not version:
+            return jsonify({'message': 'Review not found'}), 404
+
+        etag = make_etag(review_id, version.updated_at, version.author_updated_at)
+        last_modified = latest(version.updated_at, version.author_updated_at)
+        cached = not_modified(etag, last_modified)
+        if cached:
+            return cached
+
+        response = cached_json_response('reviews', [review_id, etag], lambda: ReviewDAL.get_review_data(review_id, etag))
+        if response:
+            return add_validators(response, etag, last_modified), 200
         return jsonify({'message': 'Review not found'}), 404
 
     @staticmethod
@@ -105,6 +279,10 @@ class ReviewController:
                   type: string
                   description: Review content
                   example: "This is a great product!"
+                rating:
+                  type: integer
+                  description: Optional rating from 1 to 5
+                  example: 4
                 user_id:
                   type: integer
                   description: User ID
@@ -134,7 +312,7 @@ class ReviewController:
                       description: User ID
                       example: 1
           400:
-            description: Review content or user ID is missing
+            description: Review content or user ID is missing, or the rating is invalid
             schema:
               type: object
               properties:
@@ -145,13 +323,106 @@ class ReviewController:
         data = request.get_json()
         if not data or 'content' not in data or 'user_id' not in data:
             return jsonify({'message': 'Review content and user ID are required'}), 400
+        if not ReviewController._is_valid_rating(data.get('rating')):
+            return jsonify({'message': 'Rating must be an integer from 1 to 5'}), 400
 
-        review = ReviewDAL.create_review(data['content'], data['user_id'])
+        review = ReviewDAL.create_review(data['content'], data['user_id'], data.get('rating'))
         return jsonify({
             'message': "Review created successfully.",
             'review': review.to_dict()
         }), 201
 
+    @staticmethod
+    def bulk_add_reviews():
+        """
+        Add many reviews in one request
+        ---
+        tags:
+          - Reviews
+        security:
+          - bearerAuth: []
+        consumes:
+          - application/json
+          - application/x-ndjson
+        parameters:
+          - name: reviews
+            in: body
+            required: true
+            description: A JSON array of reviews, or one review object per line with Content-Type application/x-ndjson
+            schema:
+              type: array
+              items:
+                type: object
+                properties:
+                  content:
+                    type: string
+                    example: "Great product!"
+                  rating:
+                    type: integer
+                    example: 5
+                  user_id:
+                    type: integer
+                    example: 1
+        responses:
+          201:
+            description: Every review was inserted
+            schema:
+              type: object
+              properties:
+                inserted:
+                  type: integer
+                  example: 2
+                errors:
+                  type: array
+                  items:
+                    type: object
+          207:
+            description: Some reviews were rejected; the rest were inserted
+            schema:
+              type: object
+              properties:
+                inserted:
+                  type: integer
+                  example: 1
+                errors:
+                  type: array
+                  items:
+                    type: object
+                    properties:
+                      index:
+                        type: integer
+                        example: 1
+                      message:
+                        type: string
+                        example: "User 42 does not exist"
+          400:
+            description: Body is not a JSON array or NDJSON
+          413:
+            description: Too many reviews in one request
+        """
+        body = read_bulk_items()
+        if body is None:
+            return jsonify({'message': 'Expected a JSON array or an NDJSON body'}), 400
+        items, errors = body
+
+        if len(items) > current_app.config['BULK_MAX_ROWS']:
+            return jsonify({'message': f"At most {current_app.config['BULK_MAX_ROWS']} reviews per request"}), 413
+
+        rows = []
+        for index, item in items:
+            if not isinstance(item, dict) or not isinstance(item.get('content'), str) or not item['content'].strip():
+                errors.append({'index': index, 'message': 'Review content is required'})
+            elif not isinstance(item.get('user_id'), int) or isinstance(item['user_id'], bool):
+                errors.append({'index': index, 'message': 'User ID must be an integer'})
+            elif not ReviewController._is_valid_rating(item.get('rating')):
+                errors.append({'index': index, 'message': 'Rating must be an integer from 1 to 5'})
+            else:
+                rows.append((index, item['content'], item['user_id'], item.get('rating')))
+
+        inserted, insert_errors = ReviewDAL.bulk_create_reviews(rows, current_app.config['BULK_INSERT_CHUNK_SIZE'])
+        errors = sorted(errors + insert_errors, key=lambda error: error['index'])
+        return jsonify({'inserted': inserted, 'errors': errors}), 207 if errors else 201
+
     @staticmethod
     def update_review(review_id):
         """
@@ -178,6 +449,10 @@ class ReviewController:
                   type: string
                   description: Review content
                   example: "Updated review content"
+                rating:
+                  type: integer
+                  description: Rating from 1 to 5, or null to remove the rating
+                  example: 3
         responses:
           200:
             description: Review updated successfully
@@ -203,13 +478,13 @@ class ReviewController:
                       description: User ID
                       example: 1
           400:
-            description: Review content is required
+            description: Review content or rating is required, or the rating is invalid
             schema:
               type: object
               properties:
                 message:
                   type: string
-                  example: "Review content is required"
+                  example: "Review content or rating is required"
           404:
             description: Review not found
             schema:
@@ -220,10 +495,13 @@ class ReviewController:
                   example: "Review not found"
         """
         data = request.get_json()
-        if not data or 'content' not in data:
-            return jsonify({'message': 'Review content is required'}), 400
+        if not data or ('content' not in data and 'rating' not in data):
+            return jsonify({'message': 'Review content or rating is required'}), 400
+        if not ReviewController._is_valid_rating(data.get('rating')):
+            return jsonify({'message': 'Rating must be an integer from 1 to 5'}), 400
 
-        review = ReviewDAL.update_review(review_id, data['content'])
+        review = ReviewDAL.update_review(review_id, data.get('content'), data.get('rating'),
+                                         clear_rating='rating' in data and data['rating'] is None)
         if review:
             return jsonify({
                 'message': "Review updated successfully.",
@@ -269,3 +547,137 @@ class ReviewController:
         if deleted:
             return jsonify({'message': 'Review deleted successfully.'}), 200
         return jsonify({'message': 'Review not found'}), 404
+
+    @staticmethod
+    def get_rating_summary(user_id):
+        """
+        Get a user's rating summary
+        ---
+        tags:
+          - Reviews
+        security:
+          - bearerAuth: []
+        parameters:
+          - name: user_id
+            in: path
+            required: true
+            type: integer
+        responses:
+          200:
+            description: Rating count, sum, average and 1-5 histogram over the user's reviews
+            schema:
+              type: object
+              properties:
+                user_id:
+                  type: integer
+                  example: 1
+                count:
+                  type: integer
+                  example: 3
+                sum:
+                  type: integer
+                  example: 12
+                average:
+                  type: number
+                  example: 4.0
+                histogram:
+                  type: object
+                  example: {"1": 0, "2": 0, "3": 1, "4": 1, "5": 1}
+          404:
+            description: User not found
+        """
+        stats = ReviewDAL.get_rating_summary(user_id)
+        if stats:
+            return jsonify(stats.to_dict()), 200
+        if UserDAL.get_user_by_id(user_id):
+            # No rated reviews yet
+            return jsonify({
+                'user_id': user_id,
+                'count': 0,
+                'sum': 0,
+                'average': None,
+                'histogram': {str(value): 0 for value in RATING_VALUES}
+            }), 200
+        return jsonify({'message': 'User not found'}), 404
+
+    @staticmethod
+    def get_user_reviews(user_id):
+        """
+        Get a user's reviews, one page at a time
+        ---
+        tags:
+          - Reviews
+        security:
+          - bearerAuth: []
+        parameters:
+          - name: user_id
+            in: path
+            required: true
+            type: integer
+          - name: limit
+            in: query
+            required: false
+            type: integer
+            description: Page size (capped by PAGINATION_MAX_LIMIT)
+            example: 50
+          - name: after
+            in: query
+            required: false
+            type: string
+            description: Cursor returned as next_cursor by the previous page
+          - name: since
+            in: query
+            required: false
+            type: string
+            format: date-time
+            description: Only reviews created at or after this ISO 8601 time
+          - name: until
+            in: query
+            required: false
+            type: string
+            format: date-time
+            description: Only reviews created before this ISO 8601 time
+          - name: If-None-Match
+            in: header
+            required: false
+            type: string
+            description: ETag of a previous response; answered with 304 if the user's reviews are unchanged
+        responses:
+          200:
+            description: A page of the user's reviews
+            schema:
+              type: object
+              properties:
+                reviews:
+                  type: array
+                  items:
+                    type: object
+                next_cursor:
+                  type: string
+                  description: Cursor for the next page, null on the last page
+          304:
+            description: Not modified since the ETag in If-None-Match
+          400:
+            description: Invalid limit, cursor or date
+          404:
+            description: User not found
+        """
+        try:
+            limit, after = parse_page_args(request.args)
+            since = datetime.fromisoformat(request.args['since']) if request.args.get('since') else None
+            until = datetime.fromisoformat(request.args['until']) if request.args.get('until') else None
+        except ValueError as e:
+            return jsonify({'message': str(e)}), 400
+
+        versions, next_cursor = ReviewDAL.get_user_review_versions(user_id, limit, after, since, until)
+        if not versions and not UserDAL.get_user_by_id(user_id):
+            return jsonify({'message': 'User not found'}), 404
+
+        etag = ReviewController._page_etag(versions, next_cursor)
+        cached = not_modified(etag)
+        if cached:
+            return cached
+
+        rows, next_cursor = ReviewDAL.get_user_review_rows(user_id, limit, after, since, until)
+        response = json_list_response('reviews', map(review_row_json, rows), next_cursor=next_cursor)
+        return add_validators(response, etag), 200
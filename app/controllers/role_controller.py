@@ -1,5 +1,7 @@
 from flask import jsonify, request
 from app.DAL.role_Dal import RoleDAL
+from app.utils.compression import cached_json_response
+from app.utils.conditional import add_validators, make_etag, not_modified
 
 class RoleController:
     from flask import jsonify, request
@@ -31,11 +33,19 @@ class RoleController:
                     type: string
                     description: Role name
                     example: "Admin"
+          304:
+            description: Not modified since the ETag in If-None-Match
           500:
             description: Internal Server Error
         """
-        roles = RoleDAL.list_roles()
-        return jsonify([role.to_dict() for role in roles]), 200
+        count, updated_at = RoleDAL.get_roles_version()
+        etag = make_etag(count, updated_at)
+        cached = not_modified(etag)
+        if cached:
+            return cached
+
+        response = cached_json_response('roles', ['all', etag], lambda: RoleDAL.list_roles_data(etag))
+        return add_validators(response, etag), 200
 
     @staticmethod
     def get_role_by_id(role_id):
@@ -67,6 +77,8 @@ class RoleController:
                   type: string
                   description: Role name
                   example: "Admin"
+          304:
+            description: Not modified since the ETag in If-None-Match or the If-Modified-Since date
           404:
             description: Role not found
             schema:
@@ -76,9 +88,18 @@ class RoleController:
                   type: string
                   example: "Role not found"
         """
-        role = RoleDAL.get_role_by_id(role_id)
-        if role:
-            return jsonify(role.to_dict()), 200
+        updated_at = RoleDAL.get_role_version(role_id)
+        if not updated_at:
+            return jsonify({'message': 'Role not found'}), 404
+
+        etag = make_etag(role_id, updated_at)
+        cached = not_modified(etag, updated_at)
+        if cached:
+            return cached
+
+        response = cached_json_response('roles', [role_id, etag], lambda: RoleDAL.get_role_data(role_id, etag))
+        if response:
+            return add_validators(response, etag, updated_at), 200
         return jsonify({'message': 'Role not found'}), 404
 
     @staticmethod
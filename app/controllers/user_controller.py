@@ -1,57 +1,102 @@
-from flask import jsonify, request
+from flask import current_app, jsonify, request
 from app.DAL.user_Dal import UserDAL
+from app.DAL.role_Dal import RoleDAL
+from app.utils.bulk import read_bulk_items
+from app.utils.compression import cached_json_response
+from app.utils.conditional import add_validators, latest, make_etag, not_modified
+from app.utils.pagination import parse_page_args
+from app.utils.user_import import user_rows
 
 class UserController:
     @staticmethod
     def get_all_users():
         """
-        Get all users
+        Get users, one page at a time
         ---
         tags:
           - Users
         security:
           - bearerAuth: []
+        parameters:
+          - name: limit
+            in: query
+            required: false
+            type: integer
+            description: Page size (capped by PAGINATION_MAX_LIMIT)
+            example: 50
+          - name: after
+            in: query
+            required: false
+            type: string
+            description: Cursor returned as next_cursor by the previous page
         responses:
             200:
-                description: A list of users
+                description: A page of users
                 schema:
-                    type: array
-                    items:
-                        type: object
-                        properties:
-                            id:
-                                type: integer
-                                description: User ID
-                                example: 1
-                            username:
-                                type: string
-                                description: User username
-                                example: "johndoe"
-                            email:
-                                type: string
-                                description: User email
-                                example: "johndoe@example.com"
-                            roles:
-                                type: array
-                                items:
-                                    type: object
-                                    properties:
-                                        id:
-                                            type: integer
-                                            description: Role ID
-                                            example: 1
-                                        name:
-                                            type: string
-                                            description: Role name
-                                            example: "Admin"
-                            created_at:
-                                type: string
-                                format: date-time
-                                description: User creation time
-                                example: "2024-10-24T12:34:56Z"
+                    type: object
+                    properties:
+                        users:
+                            type: array
+                            items:
+                                type: object
+                                properties:
+                                    id:
+                                        type: integer
+                                        description: User ID
+                                        example: 1
+                                    username:
+                                        type: string
+                                        description: User username
+                                        example: "johndoe"
+                                    email:
+                                        type: string
+                                        description: User email
+                                        example: "johndoe@example.com"
+                                    roles:
+                                        type: array
+                                        items:
+                                            type: object
+                                            properties:
+                                                id:
+                                                    type: integer
+                                                    description: Role ID
+                                                    example: 1
+                                                name:
+                                                    type: string
+                                                    description: Role name
+                                                    example: "Admin"
+                                    created_at:
+                                        type: string
+                                        format: date-time
+                                        description: User creation time
+                                        example: "2024-10-24T12:34:56Z"
+                        next_cursor:
+                            type: string
+                            description: Cursor for the next page, null on the last page
+            304:
+                description: Not modified since the ETag in If-None-Match
+            400:
+                description: Invalid limit or cursor
         """
-        users = UserDAL.list_users()
-        return jsonify([user.to_dict() for user in users]), 200
+        try:
+            limit, after = parse_page_args(request.args)
+        except ValueError as e:
+            return jsonify({'message': str(e)}), 400
+
+        # Users embed their roles, so the roles table's version is part of every user's version
+        versions, next_cursor = UserDAL.list_user_versions(limit, after)
+        roles_count, roles_updated_at = RoleDAL.get_roles_version()
+        etag = make_etag(next_cursor, roles_count, roles_updated_at, *[(v.id, v.updated_at) for v in versions])
+        cached = not_modified(etag)
+        if cached:
+            return cached
+
+        users, next_cursor = UserDAL.list_users(limit, after, (roles_count, roles_updated_at))
+        response = jsonify({
+            'users': [user.to_dict() for user in users],
+            'next_cursor': next_cursor
+        })
+        return add_validators(response, etag), 200
 
     @staticmethod
     def get_user_by_id(user_id):
@@ -103,12 +148,25 @@ class UserController:
                             format: date-time
                             description: User creation time
                             example: "2024-10-24T12:34:56Z"
+            304:
+                description: Not modified since the ETag in If-None-Match or the If-Modified-Since date
             404:
                 description: User not found
         """
-        user = UserDAL.get_user_by_id(user_id)
-        if user:
-            return jsonify(user.to_dict()), 200
+        version = UserDAL.get_user_version(user_id)
+        if version is None:
+            return jsonify({'message': 'User not found'}), 404
+
+        updated_at, roles_count, roles_updated_at = version
+        etag = make_etag(user_id, updated_at, roles_count, roles_updated_at)
+        last_modified = latest(updated_at, roles_updated_at)
+        cached = not_modified(etag, last_modified)
+        if cached:
+            return cached
+
+        response = cached_json_response('users', [user_id, etag], lambda: UserDAL.get_user_data(user_id, etag))
+        if response:
+            return add_validators(response, etag, last_modified), 200
         return jsonify({'message': 'User not found'}), 404
 
     @staticmethod
@@ -185,6 +243,90 @@ class UserController:
             }), 201
         return jsonify({'message': 'User already exists'}), 409
 
+    @staticmethod
+    def bulk_add_users():
+        """
+        Add many users in one request
+        ---
+        tags:
+          - Users
+        security:
+          - bearerAuth: []
+        consumes:
+          - application/json
+          - application/x-ndjson
+        parameters:
+          - name: users
+            in: body
+            required: true
+            description: A JSON array of users, or one user object per line with Content-Type application/x-ndjson
+            schema:
+              type: array
+              items:
+                type: object
+                properties:
+                  username:
+                    type: string
+                    example: "johndoe"
+                  email:
+                    type: string
+                    example: "johndoe@example.com"
+                  password:
+                    type: string
+                  roles:
+                    type: array
+                    items:
+                      type: string
+                    example: ["User"]
+        responses:
+          201:
+            description: Every user was created
+            schema:
+              type: object
+              properties:
+                inserted:
+                  type: integer
+                  example: 2
+                errors:
+                  type: array
+                  items:
+                    type: object
+          207:
+            description: Some users were rejected (duplicates, unknown roles, missing fields); the rest were created
+            schema:
+              type: object
+              properties:
+                inserted:
+                  type: integer
+                  example: 1
+                errors:
+                  type: array
+                  items:
+                    type: object
+                    properties:
+                      index:
+                        type: integer
+                        example: 1
+                      message:
+                        type: string
+                        example: "Username johndoe already exists"
+          400:
+            description: Body is not a JSON array or NDJSON
+          413:
+            description: Too many users in one request
+        """
+        body = read_bulk_items()
+        if body is None:
+            return jsonify({'message': 'Expected a JSON array or an NDJSON body'}), 400
+        items, errors = body
+        if len(items) > current_app.config['BULK_USER_MAX_ROWS']:
+            return jsonify({'message': f"At most {current_app.config['BULK_USER_MAX_ROWS']} users per request"}), 413
+
+        rows, row_errors = user_rows(items)
+        inserted, insert_errors = UserDAL.bulk_create_users(rows, current_app.config['BULK_INSERT_CHUNK_SIZE'])
+        errors = sorted(errors + row_errors + insert_errors, key=lambda error: error['index'])
+        return jsonify({'inserted': inserted, 'errors': errors}), 207 if errors else 201
+
     @staticmethod
     def update_user(user_id):
         """
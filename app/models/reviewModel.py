@@ -1,14 +1,30 @@
 
 from app.config.connector import db  # Import db from extensions.py
 from datetime import datetime
+from app.models.types import VersionTimestamp
+
+# Ratings are whole stars on a 1-5 scale
+RATING_VALUES = range(1, 6)
+
 class Review(db.Model):
     __tablename__ = 'reviews'
     
     id = db.Column(db.Integer, primary_key=True)
     content = db.Column(db.Text, nullable=False)
+    rating = db.Column(db.SmallInteger, nullable=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)  # Correct ForeignKey reference
     user = db.relationship('User', backref=db.backref('reviews', lazy=True))
-    created_at = db.Column(db.DateTime, nullable=True, default=datetime.now)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.now)
+    updated_at = db.Column(VersionTimestamp, nullable=False, default=datetime.now, onupdate=datetime.now)
+
+    __table_args__ = (
+        # Serves keyset pagination ordered by (created_at, id)
+        db.Index('ix_reviews_created_at_id', 'created_at', 'id'),
+        # Serves a user's reviews in time order
+        db.Index('ix_reviews_user_id_created_at_id', 'user_id', 'created_at', 'id'),
+        # Serves /api/review/search; other backends use the in-process index in app.utils.search
+        db.Index('ix_reviews_content_fulltext', 'content', mysql_prefix='FULLTEXT').ddl_if(dialect='mysql'),
+    )
     
     def __repr__(self):
         return f'<Review {self.content[:20]}>'
@@ -20,10 +36,37 @@ class Review(db.Model):
         return {
             'id': self.id,
             'content': self.content,
+            'rating': self.rating,
             'user_id': self.user_id,
             'user': {
                 'id': self.user.id,
                 'username': self.user.username
             },
             'created_at': self.created_at.isoformat()
-        }
\ No newline at end of file
+        }
+
+
+class UserRatingStats(db.Model):
+    """
+    Running rating totals per author, kept in step with `reviews` by ReviewDAL
+    so a summary is a single primary-key read.
+    """
+    __tablename__ = 'user_rating_stats'
+
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    rating_count = db.Column(db.Integer, nullable=False, default=0)
+    rating_sum = db.Column(db.Integer, nullable=False, default=0)
+    count_1 = db.Column(db.Integer, nullable=False, default=0)
+    count_2 = db.Column(db.Integer, nullable=False, default=0)
+    count_3 = db.Column(db.Integer, nullable=False, default=0)
+    count_4 = db.Column(db.Integer, nullable=False, default=0)
+    count_5 = db.Column(db.Integer, nullable=False, default=0)
+
+    def to_dict(self):
+        return {
+            'user_id': self.user_id,
+            'count': self.rating_count,
+            'sum': self.rating_sum,
+            'average': round(self.rating_sum / self.rating_count, 2) if self.rating_count else None,
+            'histogram': {str(value): getattr(self, f'count_{value}') for value in RATING_VALUES}
+        }
@@ -0,0 +1,6 @@
+from sqlalchemy.dialects import mysql
+from app.config.connector import db
+
+# updated_at columns version their rows: ETags and cache keys are built from them, so they
+# keep microseconds. MySQL's plain DATETIME would give two writes in the same second one version.
+VersionTimestamp = db.DateTime().with_variant(mysql.DATETIME(fsp=6), 'mysql')
@@ -1,8 +1,8 @@
 from datetime import datetime
 
 from flask_login import UserMixin
-from app.config.connector import db  # Import db from extensions.py
-from werkzeug.security import generate_password_hash, check_password_hash
+from app.config.connector import db, password_hasher  # Import db from extensions.py
+from app.models.types import VersionTimestamp
 
 # Define the association table between users and roles
 user_roles = db.Table('user_roles',
@@ -17,13 +17,21 @@ class User(db.Model, UserMixin):
     email = db.Column(db.String(120), unique=True, nullable=False)
     password_hash = db.Column(db.String(255), nullable=False)
     created_at = db.Column(db.DateTime, nullable=True, default=datetime.now)
+    updated_at = db.Column(VersionTimestamp, nullable=False, default=datetime.now, onupdate=datetime.now)
     roles = db.relationship('Role', secondary=user_roles, backref=db.backref('users', lazy=True))
     
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = password_hasher.hash(password)
 
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return password_hasher.verify(self.password_hash, password)
+
+    def password_needs_rehash(self):
+        return password_hasher.needs_rehash(self.password_hash)
+
+    @property
+    def role_names(self):
+        return [role.name for role in self.roles]
     
     def to_dict(self):
         return {
@@ -39,6 +47,7 @@ class Role(db.Model):
     __tablename__ = 'roles'  
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(50), unique=True, nullable=False)
+    updated_at = db.Column(VersionTimestamp, nullable=False, default=datetime.now, onupdate=datetime.now)
     
     def to_dict(self):
         return {
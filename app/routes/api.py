@@ -4,12 +4,14 @@ from app.controllers.user_controller import UserController
 from app.controllers.auth_controller import AuthController
 from app.controllers.role_controller import RoleController
 from app.controllers.review_controller import ReviewController
-from app.utils.jwtdecorator import token_required, admin_required
+from app.controllers.metrics_controller import MetricsController
+from app.utils.jwtdecorator import auth_required
 
 user_bp = Blueprint('users', __name__)
 role_bp = Blueprint('roles', __name__)
 auth_bp = Blueprint('auth', __name__)
 review_bp = Blueprint('reviews', __name__)
+metrics_bp = Blueprint('metrics', __name__)
 
 # Route for user login
 auth_bp.add_url_rule('/login',  view_func=AuthController.login, methods=['POST'])
@@ -17,22 +19,31 @@ auth_bp.add_url_rule('/logout', view_func=AuthController.logout, methods=['POST'
 auth_bp.add_url_rule('/profile', view_func=login_required((AuthController.profile)), methods=['GET'])
 
 # User Routes
-user_bp.add_url_rule('/',              view_func=login_required(token_required(UserController.get_all_users)), methods=['GET'])
-user_bp.add_url_rule('/<int:user_id>', view_func=login_required(token_required(admin_required(UserController.get_user_by_id))), methods=['GET'])
-user_bp.add_url_rule('/',              view_func=login_required(token_required(admin_required(UserController.add_user))), methods=['POST'])
-user_bp.add_url_rule('/<int:user_id>', view_func=login_required(token_required(admin_required(UserController.update_user))), methods=['PUT'])
-user_bp.add_url_rule('/<int:user_id>', view_func=login_required(token_required(admin_required(UserController.delete_user))), methods=['DELETE'])
+user_bp.add_url_rule('/',              view_func=auth_required()(UserController.get_all_users), methods=['GET'])
+user_bp.add_url_rule('/<int:user_id>', view_func=auth_required(admin=True)(UserController.get_user_by_id), methods=['GET'])
+user_bp.add_url_rule('/',              view_func=auth_required(admin=True)(UserController.add_user), methods=['POST'])
+user_bp.add_url_rule('/bulk',          view_func=auth_required(admin=True)(UserController.bulk_add_users), methods=['POST'])
+user_bp.add_url_rule('/<int:user_id>', view_func=auth_required(admin=True)(UserController.update_user), methods=['PUT'])
+user_bp.add_url_rule('/<int:user_id>', view_func=auth_required(admin=True)(UserController.delete_user), methods=['DELETE'])
+user_bp.add_url_rule('/<int:user_id>/reviews', view_func=auth_required(admin=True)(ReviewController.get_user_reviews), methods=['GET'])
+user_bp.add_url_rule('/<int:user_id>/ratings', view_func=auth_required(admin=True)(ReviewController.get_rating_summary), methods=['GET'])
 
 # Role Routes
-role_bp.add_url_rule('/',              view_func=login_required(token_required(admin_required(RoleController.get_all_roles))), methods=['GET'])
-role_bp.add_url_rule('/<int:role_id>', view_func=login_required(token_required(admin_required(RoleController.get_role_by_id))), methods=['GET'])
-role_bp.add_url_rule('/',              view_func=login_required(token_required(admin_required(RoleController.add_role))), methods=['POST'])
-role_bp.add_url_rule('/<int:role_id>', view_func=login_required(token_required(admin_required(RoleController.update_role))), methods=['PUT'])
-role_bp.add_url_rule('/<int:role_id>', view_func=login_required(token_required(admin_required(RoleController.delete_role))), methods=['DELETE'])
+role_bp.add_url_rule('/',              view_func=auth_required(admin=True)(RoleController.get_all_roles), methods=['GET'])
+role_bp.add_url_rule('/<int:role_id>', view_func=auth_required(admin=True)(RoleController.get_role_by_id), methods=['GET'])
+role_bp.add_url_rule('/',              view_func=auth_required(admin=True)(RoleController.add_role), methods=['POST'])
+role_bp.add_url_rule('/<int:role_id>', view_func=auth_required(admin=True)(RoleController.update_role), methods=['PUT'])
+role_bp.add_url_rule('/<int:role_id>', view_func=auth_required(admin=True)(RoleController.delete_role), methods=['DELETE'])
 
 # Review Routes
-review_bp.add_url_rule('/',                view_func=login_required(token_required(admin_required(ReviewController.get_all_reviews))), methods=['GET'])
-review_bp.add_url_rule('/<int:review_id>', view_func=login_required(token_required(admin_required(ReviewController.get_review_by_id))), methods=['GET'])
-review_bp.add_url_rule('/',                view_func=login_required(token_required(admin_required(ReviewController.add_review))), methods=['POST'])
-review_bp.add_url_rule('/<int:review_id>', view_func=login_required(token_required(admin_required(ReviewController.update_review))), methods=['PUT'])
-review_bp.add_url_rule('/<int:review_id>', view_func=login_required(token_required(admin_required(ReviewController.delete_review))), methods=['DELETE'])
\ No newline at end of file
+review_bp.add_url_rule('/',                view_func=auth_required(admin=True)(ReviewController.get_all_reviews), methods=['GET'])
+review_bp.add_url_rule('/search',          view_func=auth_required(admin=True)(ReviewController.search_reviews), methods=['GET'])
+review_bp.add_url_rule('/export',          view_func=auth_required(admin=True)(ReviewController.export_reviews), methods=['GET'])
+review_bp.add_url_rule('/<int:review_id>', view_func=auth_required(admin=True)(ReviewController.get_review_by_id), methods=['GET'])
+review_bp.add_url_rule('/',                view_func=auth_required(admin=True)(ReviewController.add_review), methods=['POST'])
+review_bp.add_url_rule('/bulk',            view_func=auth_required(admin=True)(ReviewController.bulk_add_reviews), methods=['POST'])
+review_bp.add_url_rule('/<int:review_id>', view_func=auth_required(admin=True)(ReviewController.update_review), methods=['PUT'])
+review_bp.add_url_rule('/<int:review_id>', view_func=auth_required(admin=True)(ReviewController.delete_review), methods=['DELETE'])
+
+# Internal metrics
+metrics_bp.add_url_rule('/pool', view_func=auth_required(admin=True)(MetricsController.get_pool_stats), methods=['GET'])
@@ -0,0 +1,79 @@
+import json
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+SWAGGER_TEMPLATE = {
+    "swagger": "2.0",
+    "info": {
+        "title": "RATINGS API",
+        "description": "RATINGS Restfull API made by Flask and MySQL",
+        "contact": {
+            "responsibleOrganization": "ME",
+            "responsibleDeveloper": "Me",
+            "email": "me@me.com",
+            "url": "www.me.com",
+        }
+    },
+    "securityDefinitions": {
+        "bearerAuth": {
+            "type": "apiKey",
+            "name": "Authorization",
+            "in": "header",
+            "description": "JWT Authorization header using the Bearer scheme. Example: 'Authorization: Bearer {token}'"
+        }
+    },
+    "security": [
+        {"bearerAuth": []}
+    ],
+}
+
+
+def _static_spec_loader(path):
+    # Stands in for Swagger.get_apispecs: the file is read on the first /apispec_1.json request
+    specs = {}
+
+    def get_apispecs(endpoint='apispec_1'):
+        if endpoint not in specs:
+            with open(path, encoding='utf-8') as f:
+                specs[endpoint] = json.load(f)
+        return specs[endpoint]
+    return get_apispecs
+
+
+def init_api_docs(app):
+    """
+    Serve the Swagger UI (/apidocs) and spec (/apispec_1.json) unless SWAGGER_ENABLED is off,
+    in which case flasgger (and jsonschema, yaml, mistune) is never imported.
+
+    flasgger builds the spec from the controller docstrings on the first /apispec_1.json
+    request. With SWAGGER_SPEC_FILE set, that file (written by `flask export-apispec`)
+    is served instead and no docstring is parsed at all.
+    """
+    if not app.config.get('SWAGGER_ENABLED', True):
+        return None
+    from flasgger import Swagger
+
+    swagger = Swagger(template=SWAGGER_TEMPLATE)
+    spec_file = app.config.get('SWAGGER_SPEC_FILE')
+    if spec_file:
+        swagger.get_apispecs = _static_spec_loader(spec_file)
+    swagger.init_app(app)
+    return swagger
+
+
+@click.command('export-apispec')
+@click.argument('output', type=click.Path(dir_okay=False, writable=True))
+@with_appcontext
+def export_apispec_command(output):
+    """Write the Swagger spec built from the controller docstrings to OUTPUT (JSON)."""
+    swagger = getattr(current_app, 'swag', None)
+    if swagger is None:
+        raise click.ClickException('API docs are disabled (SWAGGER_ENABLED=false)')
+    with current_app.test_request_context():
+        # The class method, so the spec is rebuilt even when SWAGGER_SPEC_FILE is being served
+        spec = type(swagger).get_apispecs(swagger, 'apispec_1')
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(spec, f, indent=2, sort_keys=True)
+        f.write('\n')
+    click.echo(f'Wrote {len(spec.get("paths", {}))} paths to {output}')
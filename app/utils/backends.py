@@ -0,0 +1,24 @@
+from app.utils.cache import MemoryBackend
+
+# (app.extensions key, setting) of the stores every worker process has to see the same way.
+# The response cache isn't one: its keys are versioned, so a per-process copy can't go stale.
+SHARED_STORES = (
+    ('token_blocklist', 'JWT_BLOCKLIST_BACKEND'),
+    ('replica_router', 'REPLICA_STICKY_BACKEND'),
+)
+
+
+def check_shared_backends(app, workers):
+    """
+    Refuse to serve from several worker processes while one of the SHARED_STORES keeps its
+    entries in per-process memory. The app can't see how many workers the server forks, so
+    gunicorn.conf.py, wsgi.py (uWSGI) and asgi.py (uvicorn) call this with the number.
+    """
+    if workers <= 1:
+        return
+    local = [setting for name, setting in SHARED_STORES
+             if getattr(app.extensions.get(name), 'enabled', True)
+             and isinstance(getattr(app.extensions.get(name), 'backend', None), MemoryBackend)]
+    if local:
+        raise RuntimeError(f"{', '.join(local)}=memory only covers one process; "
+                           f"use redis to run {workers} workers")
@@ -0,0 +1,24 @@
+import json
+from flask import request
+
+
+def read_bulk_items():
+    """
+    Items of a bulk request body: a JSON array, or one JSON value per line with Content-Type
+    application/x-ndjson. Returns (items, errors) with items as (index, item) and errors for
+    lines that aren't valid JSON, or None when the body is neither.
+    """
+    if request.mimetype == 'application/x-ndjson':
+        items, errors = [], []
+        for index, line in enumerate(request.get_data(as_text=True).splitlines()):
+            if not line.strip():
+                continue
+            try:
+                items.append((index, json.loads(line)))
+            except ValueError:
+                errors.append({'index': index, 'message': 'Invalid JSON'})
+        return items, errors
+    data = request.get_json(silent=True)
+    if not isinstance(data, list):
+        return None
+    return list(enumerate(data)), []
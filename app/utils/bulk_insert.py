@@ -0,0 +1,26 @@
+from sqlalchemy.exc import SQLAlchemyError
+from app.config.connector import db
+
+
+def insert_in_chunks(rows, chunk_size, insert_chunk):
+    """
+    Call insert_chunk(chunk, errors) for every chunk_size rows and commit after each chunk.
+    insert_chunk returns how many of the chunk's rows it inserted, and reports the rows it
+    skipped by appending {'index', 'message'} to errors. A chunk that raises a database error
+    is rolled back and only loses its own rows; earlier chunks are already committed.
+    `rows` are tuples starting with their index. Returns (inserted_count, errors).
+    """
+    inserted = 0
+    errors = []
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        try:
+            count = insert_chunk(chunk, errors)
+            db.session.commit()
+            inserted += count
+        except SQLAlchemyError:
+            db.session.rollback()
+            reported = {error['index'] for error in errors}
+            errors.extend({'index': row[0], 'message': 'Database error while inserting'}
+                          for row in chunk if row[0] not in reported)
+    return inserted, errors
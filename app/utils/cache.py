@@ -0,0 +1,166 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+class NullBackend:
+    """
+    Backend that stores nothing; every read is a miss.
+    """
+    def get(self, key):
+        return None
+
+    def set(self, key, value, ttl):
+        pass
+
+    def delete(self, *keys):
+        pass
+
+
+class MemoryBackend:
+    """
+    In-process LRU cache with a per-entry TTL.
+    """
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_BYTES_MARKER = b'\x00'
+
+
+class RedisBackend:
+    """
+    Store shared by every worker. `client` is anything with redis-py's get/set/delete,
+    so tests can pass a local stand-in instead of a real server.
+    """
+    def __init__(self, client, prefix='ratings:'):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url, prefix='ratings:'):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError('The redis backend requires the redis package')
+        return cls(redis.Redis.from_url(url), prefix)
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        if raw is None:
+            return None
+        if raw[:1] == _BYTES_MARKER:
+            return raw[1:]
+        return json.loads(raw)
+
+    def set(self, key, value, ttl):
+        # bytes (e.g. a precompressed response body) are stored as-is behind a marker JSON can't start with
+        raw = _BYTES_MARKER + value if isinstance(value, bytes) else json.dumps(value)
+        self.client.set(self.prefix + key, raw, ex=ttl or None)
+
+    def delete(self, *keys):
+        if keys:
+            self.client.delete(*(self.prefix + key for key in keys))
+
+
+def backend_from_config(app, name, key_prefix, max_entries, memory_class=MemoryBackend, allow_none=False):
+    """
+    The store selected by the <name>_BACKEND setting: 'memory' (memory_class holding up to
+    <name>_MAX_ENTRIES entries), 'redis' (on <name>_REDIS_URL, keys under key_prefix) or, when
+    allow_none, 'none'. Any value that isn't a string is used as the backend itself.
+    """
+    backend = app.config.get(f'{name}_BACKEND', 'memory')
+    if backend == 'memory':
+        return memory_class(app.config.get(f'{name}_MAX_ENTRIES', max_entries))
+    if backend == 'redis':
+        return RedisBackend.from_url(app.config[f'{name}_REDIS_URL'], prefix=key_prefix)
+    if allow_none and backend in (None, 'none'):
+        return NullBackend()
+    if isinstance(backend, str) or backend is None:
+        raise ValueError(f'Unknown {name}_BACKEND {backend!r}')
+    return backend
+
+
+class Cache:
+    """
+    Read-through cache for serialized DAL results.
+
+    Keys live in namespaces ('reviews', 'users', 'roles') and end with the version of the rows
+    the value was built from (the ETag the controller computed from updated_at columns).
+    A write changes that version, so every process stops reading the old entry without being
+    told; old entries age out through the TTL and the LRU. Writers never invalidate anything,
+    which also means a reader that loaded a row before a write can't store it over the newer one.
+    Values must be JSON-serializable or bytes so every backend can store them.
+
+    So every hit still costs one query for the version, but only that query: for a review or
+    a user it replaces the row, author or roles lookups and the serialization. Roles are a
+    single small query either way, so caching them saves little. Caching the versions as well
+    would need invalidation on write reaching every process, which is what versioning avoids.
+
+    An entry can have variants, e.g. the same review as a gzip-compressed response body,
+    stored under their own keys.
+    """
+
+    def __init__(self, backend=None, default_ttl=300):
+        self.backend = backend or NullBackend()
+        self.default_ttl = default_ttl
+
+    def init_app(self, app):
+        self.backend = backend_from_config(app, 'CACHE', 'ratings:', 10000, allow_none=True)
+        self.default_ttl = app.config.get('CACHE_DEFAULT_TTL', self.default_ttl)
+        app.extensions['cache'] = self
+
+    def key(self, namespace, *parts, variant=None):
+        key = ':'.join([namespace] + [str(part) for part in parts])
+        return f'{key}|{variant}' if variant else key
+
+    def get(self, namespace, parts, variant=None):
+        return self.backend.get(self.key(namespace, *parts, variant=variant))
+
+    def set(self, namespace, parts, value, ttl=None, variant=None):
+        self.backend.set(self.key(namespace, *parts, variant=variant), value, ttl or self.default_ttl)
+
+    def get_or_load(self, namespace, parts, loader, ttl=None):
+        """
+        Return the cached value for (namespace, *parts), calling loader() on a miss.
+        None results are not cached.
+        """
+        key = self.key(namespace, *parts)
+        value = self.backend.get(key)
+        if value is None:
+            value = loader()
+            if value is not None:
+                self.backend.set(key, value, ttl or self.default_ttl)
+        return value
@@ -0,0 +1,158 @@
+import zlib
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:  # optional dependency; without it only gzip is offered
+    brotli = None
+
+
+class _GzipStream:
+    def __init__(self, level):
+        # wbits 16+ writes a gzip header and trailer instead of a raw zlib stream
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data):
+        return self._compressor.compress(data)
+
+    def flush(self):
+        return self._compressor.flush()
+
+
+class _BrotliStream:
+    def __init__(self, quality):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data):
+        return self._compressor.process(data)
+
+    def flush(self):
+        return self._compressor.finish()
+
+
+class Compressor:
+    """
+    Content-Encoding negotiation for responses.
+
+    An after_request hook compresses responses of a compressible mimetype once they reach
+    COMPRESS_MIN_SIZE bytes, using the best of COMPRESS_ALGORITHMS the client accepts.
+    Streamed responses (the export) are compressed chunk by chunk as they are sent.
+    Compressed responses carry a weak ETag: the bytes differ from the identity representation,
+    but the content they decode to does not.
+    """
+    def __init__(self):
+        self.algorithms = ()
+        self.min_size = 1024
+        self.mimetypes = frozenset()
+        self.gzip_level = 6
+        self.brotli_quality = 4
+
+    def init_app(self, app):
+        algorithms = [name.strip() for name in app.config.get('COMPRESS_ALGORITHMS', 'br,gzip').split(',') if name.strip()]
+        for name in algorithms:
+            if name not in ('br', 'gzip'):
+                raise ValueError(f'Unknown compression algorithm {name!r} in COMPRESS_ALGORITHMS')
+        self.algorithms = tuple(name for name in algorithms if name != 'br' or brotli is not None)
+        self.min_size = app.config.get('COMPRESS_MIN_SIZE', self.min_size)
+        self.mimetypes = frozenset(app.config.get('COMPRESS_MIMETYPES', 'application/json').split(','))
+        self.gzip_level = app.config.get('COMPRESS_GZIP_LEVEL', self.gzip_level)
+        self.brotli_quality = app.config.get('COMPRESS_BROTLI_QUALITY', self.brotli_quality)
+        app.extensions['compressor'] = self
+        app.after_request(self.after_request)
+
+    def negotiate(self):
+        """
+        The encoding to use for the current request, or None for identity.
+        """
+        if not self.algorithms:
+            return None
+        return request.accept_encodings.best_match(self.algorithms)
+
+    def stream(self, encoding):
+        if encoding == 'br':
+            return _BrotliStream(self.brotli_quality)
+        return _GzipStream(self.gzip_level)
+
+    def compress(self, data, encoding):
+        stream = self.stream(encoding)
+        return stream.compress(data) + stream.flush()
+
+    def _compressible(self, response):
+        return (
+            response.mimetype in self.mimetypes
+            and 200 <= response.status_code < 300 and response.status_code != 204
+            and not response.direct_passthrough
+            and 'no-transform' not in response.headers.get('Cache-Control', '')
+        )
+
+    def after_request(self, response):
+        if not self._compressible(response):
+            return response
+        response.vary.add('Accept-Encoding')
+        if 'Content-Encoding' in response.headers:
+            # Already compressed, e.g. a body served from the cache by cached_json_response
+            return _weaken_etag(response)
+
+        encoding = self.negotiate()
+        if encoding is None:
+            return response
+        if response.is_streamed:
+            close = getattr(response.response, 'close', None)
+            response.response = self._compress_stream(response.iter_encoded(), close, encoding)
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            if len(data) < self.min_size:
+                return response
+            response.set_data(self.compress(data, encoding))
+        response.headers['Content-Encoding'] = encoding
+        return _weaken_etag(response)
+
+    def _compress_stream(self, chunks, close, encoding):
+        stream = self.stream(encoding)
+        try:
+            for chunk in chunks:
+                data = stream.compress(chunk)
+                if data:
+                    yield data
+            yield stream.flush()
+        finally:
+            if close is not None:
+                close()
+
+
+def _weaken_etag(response):
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def cached_json_response(namespace, parts, loader):
+    """
+    JSON response for loader()'s value, or None when loader() returns None.
+
+    When the client accepts compression, the compressed body is cached next to the entry as
+    one of its variants, so repeat hits skip both serialization and compression. `parts` must
+    end with the entry's version, so the compressed copies go stale together with it.
+    """
+    cache = current_app.extensions['cache']
+    compressor = current_app.extensions['compressor']
+    encoding = compressor.negotiate()
+    if encoding:
+        body = cache.get(namespace, parts, variant=encoding)
+        if body is not None:
+            response = current_app.response_class(body, mimetype='application/json')
+            response.headers['Content-Encoding'] = encoding
+            return response
+
+    data = loader()
+    if data is None:
+        return None
+    response = current_app.json.response(data)
+    if encoding and response.content_length >= compressor.min_size:
+        body = compressor.compress(response.get_data(), encoding)
+        cache.set(namespace, parts, body, variant=encoding)
+        response.set_data(body)
+        response.headers['Content-Encoding'] = encoding
+    return response
@@ -0,0 +1,42 @@
+import hashlib
+from flask import make_response, request
+
+
+def make_etag(*parts):
+    """
+    Strong ETag from the row versions a response is built from (ids, updated_at, ...),
+    so it can be computed before the body is loaded or serialized.
+    """
+    return hashlib.sha1(repr(parts).encode()).hexdigest()
+
+
+def latest(*timestamps):
+    timestamps = [timestamp for timestamp in timestamps if timestamp is not None]
+    return max(timestamps) if timestamps else None
+
+
+def not_modified(etag, last_modified=None):
+    """
+    Return a 304 response if the request's If-None-Match / If-Modified-Since already
+    covers this version, otherwise None. If-Modified-Since is only consulted when
+    If-None-Match is absent, as RFC 9110 requires, and only with a last_modified. Collections
+    pass none, because deleting a member never moves the newest remaining updated_at forward.
+    If-None-Match uses weak comparison, so the weak ETags of compressed responses match too.
+    """
+    if request.if_none_match:
+        fresh = request.if_none_match.contains_weak(etag)
+    elif request.if_modified_since and last_modified is not None:
+        fresh = last_modified.replace(microsecond=0) <= request.if_modified_since.replace(tzinfo=None)
+    else:
+        fresh = False
+    if not fresh:
+        return None
+    response = make_response('', 304)
+    return add_validators(response, etag, last_modified)
+
+
+def add_validators(response, etag, last_modified=None):
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    return response
@@ -0,0 +1,120 @@
+import bisect
+import threading
+import time
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
+
+# Options only QueuePool accepts; in-memory SQLite runs on a StaticPool that rejects them
+QUEUE_POOL_OPTIONS = ('pool_size', 'max_overflow', 'pool_timeout')
+
+
+class WaitHistogram:
+    """
+    Cumulative histogram of connection checkout times, in seconds.
+    """
+    BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+    def __init__(self):
+        self._counts = [0] * (len(self.BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        index = bisect.bisect_left(self.BUCKETS, seconds)
+        with self._lock:
+            self._counts[index] += 1
+            self.count += 1
+            self.sum += seconds
+
+    def snapshot(self):
+        with self._lock:
+            counts = list(self._counts)
+            total, count = self.sum, self.count
+        buckets, running = {}, 0
+        for bound, bucket_count in zip(self.BUCKETS + ('+Inf',), counts):
+            running += bucket_count
+            buckets[str(bound)] = running
+        return {'buckets': buckets, 'count': count, 'sum': total}
+
+
+class MonitoredQueuePool(QueuePool):
+    """
+    QueuePool that records how long each checkout took (queue wait, plus connect and
+    pre-ping when they happen) and how many checkouts timed out.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_time = WaitHistogram()
+        self.timeouts = 0
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            self.wait_time.observe(time.perf_counter() - start)
+
+
+def engine_options(url, options):
+    """
+    Engine options for `url`: `options` (SQLALCHEMY_ENGINE_OPTIONS) with MonitoredQueuePool as
+    the pool class, or without the QueuePool-only options for in-memory SQLite.
+    """
+    options = dict(options)
+    url = make_url(url)
+    if url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:'):
+        for name in QUEUE_POOL_OPTIONS:
+            options.pop(name, None)
+    else:
+        options.setdefault('poolclass', MonitoredQueuePool)
+    return options
+
+
+def configure_engines(app):
+    """
+    Apply engine_options to the main database and to every SQLALCHEMY_BINDS entry, which
+    Flask-SQLAlchemy would otherwise create without SQLALCHEMY_ENGINE_OPTIONS.
+    """
+    options = app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {})
+    binds = {}
+    for key, bind in app.config.get('SQLALCHEMY_BINDS', {}).items():
+        bind = dict(bind) if isinstance(bind, dict) else {'url': bind}
+        binds[key] = {**engine_options(bind['url'], options), **bind}
+    app.config['SQLALCHEMY_BINDS'] = binds
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config['SQLALCHEMY_DATABASE_URI'], options)
+
+
+def dispose_engines(app, close=True):
+    """
+    Empty every engine's pool. In a freshly forked worker pass close=False: the inherited
+    connections belong to the parent, so they are dropped without being closed and the
+    worker opens its own sockets.
+    """
+    with app.app_context():
+        for engine in app.extensions['sqlalchemy'].engines.values():
+            engine.dispose(close=close)
+
+
+def pool_stats(engine):
+    """
+    Live statistics for an engine's connection pool.
+    """
+    pool = engine.pool
+    stats = {'pool': type(pool).__name__, 'status': pool.status()}
+    if isinstance(pool, QueuePool):
+        stats.update({
+            'size': pool.size(),
+            'checked_out': pool.checkedout(),
+            'checked_in': pool.checkedin(),
+            # overflow() counts up from -size, so it is negative until the pool is full
+            'overflow': max(pool.overflow(), 0),
+        })
+    if isinstance(pool, MonitoredQueuePool):
+        stats['timeouts'] = pool.timeouts
+        stats['wait_seconds'] = pool.wait_time.snapshot()
+    return stats
@@ -0,0 +1,89 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.security import check_password_hash, generate_password_hash
+from app.utils.metrics import phase_timer
+
+
+class PasswordHasherBusy(Exception):
+    """
+    Raised when more hashes are queued than PASSWORD_HASH_MAX_PENDING allows.
+    """
+
+
+class PasswordHasher:
+    """
+    Runs the password KDF on a small thread pool instead of every request thread.
+
+    hashlib's pbkdf2/scrypt release the GIL, so the pool bounds how many hashes burn CPU at
+    once while callers simply wait. Once PASSWORD_HASH_MAX_PENDING hashes are queued or
+    running, new calls fail fast with PasswordHasherBusy (served as 503) instead of piling up.
+    """
+    def __init__(self, method='scrypt', salt_length=16, workers=2, max_pending=32, bulk_workers=2):
+        self.method = method
+        self.salt_length = salt_length
+        self.workers = workers
+        self.max_pending = max_pending
+        self.bulk_workers = bulk_workers
+        self._executor = None
+        self._bulk_executor = None
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._prefix = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.method = app.config.get('PASSWORD_HASH_METHOD', self.method)
+        self.salt_length = app.config.get('PASSWORD_HASH_SALT_LENGTH', self.salt_length)
+        self.workers = app.config.get('PASSWORD_HASH_WORKERS', self.workers)
+        self.max_pending = app.config.get('PASSWORD_HASH_MAX_PENDING', self.max_pending)
+        self.bulk_workers = app.config.get('PASSWORD_HASH_BULK_WORKERS', self.bulk_workers)
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._prefix = None
+        self.shutdown()
+
+    def shutdown(self):
+        with self._lock:
+            for executor in (self._executor, self._bulk_executor):
+                if executor is not None:
+                    executor.shutdown(wait=False)
+            self._executor = self._bulk_executor = None
+
+    @phase_timer('password_hash')
+    def _submit(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHasherBusy()
+        try:
+            with self._lock:
+                # Created on first use so each forked worker gets its own threads
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix='password-hash')
+                future = self._executor.submit(fn, *args)
+            return future.result()
+        finally:
+            self._slots.release()
+
+    def hash(self, password):
+        return self._submit(generate_password_hash, password, self.method, self.salt_length)
+
+    @phase_timer('password_hash')
+    def hash_many(self, passwords):
+        """
+        Hash a batch of passwords (bulk imports) on a separate pool of PASSWORD_HASH_BULK_WORKERS
+        threads, so a large import neither waits behind request hashing nor gets PasswordHasherBusy.
+        """
+        with self._lock:
+            if self._bulk_executor is None:
+                self._bulk_executor = ThreadPoolExecutor(self.bulk_workers, thread_name_prefix='password-hash-bulk')
+            executor = self._bulk_executor
+        return list(executor.map(lambda password: generate_password_hash(password, self.method, self.salt_length), passwords))
+
+    def verify(self, pwhash, password):
+        return self._submit(check_password_hash, pwhash, password)
+
+    def needs_rehash(self, pwhash):
+        """
+        True when pwhash was made with a different method or cost than the configured one.
+        """
+        if self._prefix is None:
+            # werkzeug expands a bare 'scrypt'/'pbkdf2' into its full parameter string
+            self._prefix = generate_password_hash('', self.method, 1).split('$', 1)[0]
+        return pwhash.split('$', 1)[0] != self._prefix
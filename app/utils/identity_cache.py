@@ -0,0 +1,48 @@
+from flask_login import UserMixin
+from app.utils.cache import MemoryBackend
+
+
+class SessionUser(UserMixin):
+    """
+    Lightweight stand-in for User that Flask-Login hands to views as current_user.
+    Built from cached columns, so it never touches the database.
+    """
+    def __init__(self, id, username, email, role_names):
+        self.id = id
+        self.username = username
+        self.email = email
+        self.role_names = role_names
+
+
+class IdentityCache:
+    """
+    Per-process, short-TTL cache of authenticated users and their role names.
+    Entries are dropped explicitly when the user or a role changes. A TTL of 0 disables caching.
+    """
+    def __init__(self, ttl=60, max_entries=10000):
+        self.ttl = ttl
+        self._backend = MemoryBackend(max_entries)
+
+    def init_app(self, app):
+        self.ttl = app.config.get('IDENTITY_CACHE_TTL', self.ttl)
+        self._backend = MemoryBackend(app.config.get('IDENTITY_CACHE_MAX_ENTRIES', 10000))
+
+    def get_or_load(self, user_id, loader):
+        """
+        Return a SessionUser for user_id, calling loader(user_id) for the User row on a miss.
+        """
+        entry = self._backend.get(user_id)
+        if entry is None:
+            user = loader(user_id)
+            if user is None:
+                return None
+            entry = (user.id, user.username, user.email, [role.name for role in user.roles])
+            if self.ttl > 0:
+                self._backend.set(user_id, entry, self.ttl)
+        return SessionUser(*entry)
+
+    def invalidate(self, user_id):
+        self._backend.delete(user_id)
+
+    def clear(self):
+        self._backend.clear()
@@ -0,0 +1,141 @@
+import click
+from datetime import datetime
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import event, text
+from app.config.connector import db
+
+
+def _probes():
+    """
+    One call per DAL read path, with placeholder arguments. Only the SQL they emit matters.
+    The third element marks queries that read the whole table by design.
+    """
+    from app.DAL.review_Dal import ReviewDAL
+    from app.DAL.role_Dal import RoleDAL
+    from app.DAL.user_Dal import UserDAL
+
+    def first_exported_review():
+        stream = ReviewDAL.stream_review_rows(10)
+        next(stream, None)
+        stream.close()
+
+    # Other backends search an in-process index, built from the whole reviews table
+    search_reads_whole_table = db.engine.dialect.name != 'mysql'
+
+    return [
+        ('ReviewDAL.list_reviews', lambda: ReviewDAL.list_reviews(10), False),
+        ('ReviewDAL.list_reviews(after=...)', lambda: ReviewDAL.list_reviews(10, (datetime(2000, 1, 1), 1)), False),
+        ('ReviewDAL.get_review_by_id', lambda: ReviewDAL.get_review_by_id(1), False),
+        ('ReviewDAL.get_reviews_by_user_id', lambda: ReviewDAL.get_reviews_by_user_id(1, 10), False),
+        ('ReviewDAL.get_review_version', lambda: ReviewDAL.get_review_version(1), False),
+        ('ReviewDAL.list_review_versions', lambda: ReviewDAL.list_review_versions(10), False),
+        ('ReviewDAL.get_user_review_versions', lambda: ReviewDAL.get_user_review_versions(1, 10), False),
+        ('ReviewDAL.stream_review_rows', first_exported_review, True),
+        ('ReviewDAL.list_review_rows', lambda: ReviewDAL.list_review_rows(10), False),
+        ('ReviewDAL.get_user_review_rows', lambda: ReviewDAL.get_user_review_rows(1, 10), False),
+        ('ReviewDAL.get_rating_summary', lambda: ReviewDAL.get_rating_summary(1), False),
+        ('ReviewDAL.search_reviews', lambda: ReviewDAL.search_reviews('audit', 10), search_reads_whole_table),
+        ('UserDAL.list_users', lambda: UserDAL.list_users(10), False),
+        ('UserDAL.list_users(after=...)', lambda: UserDAL.list_users(10, (None, 1)), False),
+        ('UserDAL.get_user_by_id', lambda: UserDAL.get_user_by_id(1), False),
+        ('UserDAL.get_user_version', lambda: UserDAL.get_user_version(1), False),
+        ('UserDAL.list_user_versions', lambda: UserDAL.list_user_versions(10), False),
+        ('UserDAL.get_user_by_email', lambda: UserDAL.get_user_by_email('audit@example.com'), False),
+        ('UserDAL._skip_existing', lambda: UserDAL._skip_existing([(0, 'audit', 'audit@example.com', 'x', [])], []), False),
+        ('UserDAL._roles_by_name', lambda: UserDAL._roles_by_name(['Admin']), False),
+        ('RoleDAL.list_roles', RoleDAL.list_roles, True),
+        ('RoleDAL.cached_roles', lambda: RoleDAL.cached_roles(refresh=True), True),
+        ('RoleDAL.get_role_by_id', lambda: RoleDAL.get_role_by_id(1), False),
+        ('RoleDAL.get_role_version', lambda: RoleDAL.get_role_version(1), False),
+        ('RoleDAL.get_roles_version', RoleDAL.get_roles_version, True),
+        ('RoleDAL.get_role_by_name', lambda: RoleDAL.get_role_by_name('Admin'), False),
+    ]
+
+
+def _capture_selects(probe):
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            statements.append((statement, parameters))
+
+    event.listen(db.engine, 'before_cursor_execute', capture)
+    try:
+        probe()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', capture)
+        db.session.rollback()
+    return statements
+
+
+def _full_scans(connection, statement, parameters):
+    """
+    Return [(table, rows)] for every full scan of a table, or of one of its indexes, in the
+    statement's plan. An ordered walk that LIMIT stops early doesn't count, as long as no
+    filter can make it skip rows and no sort step has to read everything first.
+    """
+    words = statement.upper().split()
+    limited = 'LIMIT' in words
+    dialect = connection.dialect.name
+    if dialect == 'mysql':
+        plan = connection.exec_driver_sql('EXPLAIN ' + statement, parameters).mappings()
+        scans = []
+        for row in plan:
+            # ALL reads the table, index reads a whole index
+            if row['type'] not in ('ALL', 'index'):
+                continue
+            extra = row['Extra'] or ''
+            if limited and not any(step in extra for step in ('Using where', 'Using filesort', 'Using temporary')):
+                continue
+            scans.append((row['table'], row['rows'] or 0))
+        return scans
+    if dialect == 'sqlite':
+        details = [row[-1] for row in connection.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters)]
+        # The plan doesn't show filters, so any WHERE clause counts as one
+        stops_early = (limited and 'WHERE' not in words
+                       and not any('TEMP B-TREE' in detail for detail in details))
+        scans = []
+        for detail in details:
+            # "SCAN reviews" reads the table, "SCAN reviews USING [COVERING] INDEX ..." a whole index
+            if detail.startswith('SCAN ') and not stops_early:
+                table = detail.split()[1]
+                rows = connection.execute(text(f'SELECT COUNT(*) FROM "{table}"')).scalar()
+                scans.append((table, rows))
+        return scans
+    raise click.ClickException(f'EXPLAIN parsing is not implemented for {dialect}')
+
+
+@click.command('audit-indexes')
+@click.option('--min-rows', type=int, default=None,
+              help='Fail on full scans of tables with more rows than this (default: INDEX_AUDIT_MIN_ROWS).')
+@with_appcontext
+def audit_indexes_command(min_rows):
+    """
+    EXPLAIN every DAL query and fail if any of them fully scans a large table.
+    """
+    if min_rows is None:
+        min_rows = current_app.config['INDEX_AUDIT_MIN_ROWS']
+
+    failures = 0
+    with db.engine.connect() as connection:
+        for label, probe, reads_whole_table in _probes():
+            if reads_whole_table:
+                click.echo(f'skip  {label} (reads the whole table by design)')
+                continue
+            failed = False
+            for statement, parameters in _capture_selects(probe):
+                scans = [(table, rows) for table, rows in _full_scans(connection, statement, parameters) if rows > min_rows]
+                if scans:
+                    failed = True
+                    tables = ', '.join(f'{table} (~{rows} rows)' for table, rows in scans)
+                    click.echo(f'FAIL  {label}: full scan of {tables}')
+                    click.echo(f'      {" ".join(statement.split())}')
+            if failed:
+                failures += 1
+            else:
+                click.echo(f'ok    {label}')
+
+    if failures:
+        raise click.ClickException(f'{failures} quer{"y" if failures == 1 else "ies"} scan tables above {min_rows} rows')
+    click.echo('No full scans above the threshold.')
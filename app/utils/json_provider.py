@@ -0,0 +1,74 @@
+import json
+from flask.json.provider import DefaultJSONProvider
+from app.utils.metrics import phase_timer
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """
+    Flask's provider, with encoding time recorded as the request's 'serialization' phase.
+    """
+    @phase_timer('serialization')
+    def dumps(self, obj, **kwargs):
+        return super().dumps(obj, **kwargs)
+
+    @phase_timer('serialization')
+    def response(self, *args, **kwargs):
+        return super().response(*args, **kwargs)
+
+
+class CompactJSONProvider(TimedJSONProvider):
+    """
+    Pure-Python fallback: the stdlib encoder without key sorting, indentation or ASCII escaping,
+    which is noticeably cheaper on large list responses than Flask's defaults.
+    """
+    sort_keys = False
+    ensure_ascii = False
+    compact = True
+
+
+class OrjsonProvider(CompactJSONProvider):
+    """
+    orjson-backed provider. orjson writes naive datetimes in the same ISO 8601 form as
+    datetime.isoformat(), and falls back to Flask's default() for anything it can't encode.
+    """
+    @phase_timer('serialization')
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            # Callers asking for stdlib-specific options (indent, cls, ...) get the stdlib encoder
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default).decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return json.loads(s, **kwargs)
+        return orjson.loads(s)
+
+    @phase_timer('serialization')
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj, default=self.default), mimetype=self.mimetype)
+
+
+def init_json_provider(app):
+    """
+    Install the provider named by JSON_PROVIDER: 'orjson', 'compact', 'default' (Flask's encoder),
+    or 'auto' (orjson when installed, otherwise compact).
+    """
+    name = app.config.get('JSON_PROVIDER', 'auto')
+    if name == 'auto':
+        name = 'orjson' if orjson is not None else 'compact'
+    if name == 'orjson':
+        if orjson is None:
+            raise RuntimeError('JSON_PROVIDER=orjson requires the orjson package')
+        app.json = OrjsonProvider(app)
+    elif name == 'compact':
+        app.json = CompactJSONProvider(app)
+    elif name == 'default':
+        app.json = TimedJSONProvider(app)
+    else:
+        raise ValueError(f'Unknown JSON_PROVIDER {name!r}')
@@ -1,7 +1,7 @@
 from flask import current_app, request, jsonify
 from functools import wraps
 import jwt
-from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from flask_jwt_extended import get_jwt, get_jwt_identity, verify_jwt_in_request
 
 
 def token_required(f):
@@ -22,3 +22,28 @@ def admin_required(f):
 
     return decorated
 
+
+def _token_roles():
+    claims = get_jwt()
+    if 'roles' in claims:
+        return claims['roles']
+    # Tokens issued before role names were added to the claims only carry identity['role']
+    identity = get_jwt_identity()
+    if isinstance(identity, dict) and 'role' in identity:
+        return [identity['role']]
+    return []
+
+
+# Single-pass replacement for login_required(token_required(admin_required(...))):
+# the JWT is verified once and roles come from its claims, so no session load or user lookup is needed
+def auth_required(admin=False):
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            verify_jwt_in_request()
+            if admin and 'Admin' not in _token_roles():
+                return jsonify({'message': 'Admins only!'}), 403
+            return f(*args, **kwargs)
+        return decorated
+    return decorator
+
@@ -0,0 +1,289 @@
+import bisect
+import hmac
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+from app.utils.jwtdecorator import auth_required
+
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+STATEMENT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+
+
+class _ShardedMetric:
+    """
+    Base for metrics recorded without locks: each thread writes to its own dict of
+    {label values: series}, and a scrape sums the shards. The lock is only taken the first
+    time a thread records, to register its shard.
+    """
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards = []
+        self._lock = threading.Lock()
+
+    def _shard(self):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._shards.append(shard)
+        return shard
+
+
+class Counter(_ShardedMetric):
+    kind = 'counter'
+
+    def inc(self, labels=(), amount=1):
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0) + amount
+
+    def _merged(self):
+        merged = {}
+        for shard in list(self._shards):
+            for labels, value in list(shard.items()):
+                merged[labels] = merged.get(labels, 0) + value
+        return merged
+
+    def samples(self):
+        for labels, value in sorted(self._merged().items()):
+            yield self.name, dict(zip(self.labelnames, labels)), value
+
+
+class Histogram(_ShardedMetric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=REQUEST_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, labels=()):
+        shard = self._shard()
+        series = shard.get(labels)
+        if series is None:
+            # One slot per bucket plus +Inf, then sum and count
+            series = shard[labels] = [0] * (len(self.buckets) + 3)
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def _merged(self):
+        merged = {}
+        for shard in list(self._shards):
+            for labels, series in list(shard.items()):
+                total = merged.setdefault(labels, [0] * len(series))
+                for index, value in enumerate(series):
+                    total[index] += value
+        return merged
+
+    def samples(self):
+        for labels, series in sorted(self._merged().items()):
+            labels = dict(zip(self.labelnames, labels))
+            running = 0
+            for bound, count in zip(self.buckets + ('+Inf',), series):
+                running += count
+                yield f'{self.name}_bucket', {**labels, 'le': str(bound)}, running
+            yield f'{self.name}_sum', labels, series[-2]
+            yield f'{self.name}_count', labels, series[-1]
+
+
+class _RequestMetrics:
+    __slots__ = ('start', 'status', 'statements', 'db_seconds', 'phases', 'active')
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.status = None
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.phases = {}
+        self.active = set()
+
+
+@contextmanager
+def phase_timer(phase):
+    """
+    Add the time spent in the block to the current request's `phase` (e.g. 'serialization').
+    Nested blocks of the same phase are only counted once. Usable as a decorator.
+    """
+    state = g.get('_request_metrics') if has_request_context() else None
+    if state is None or phase in state.active:
+        yield
+        return
+    state.active.add(phase)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        state.active.discard(phase)
+        state.phases[phase] = state.phases.get(phase, 0.0) + time.perf_counter() - start
+
+
+def scrape_token_or_admin(view):
+    """
+    Let a request through with `Authorization: Bearer <METRICS_TOKEN>` (for a scraper) or an
+    admin JWT, like the other metrics endpoints.
+    """
+    admin_view = auth_required(admin=True)(view)
+
+    @wraps(view)
+    def decorated(*args, **kwargs):
+        token = current_app.config.get('METRICS_TOKEN')
+        if token and hmac.compare_digest(request.headers.get('Authorization', '').encode(), f'Bearer {token}'.encode()):
+            return view(*args, **kwargs)
+        return admin_view(*args, **kwargs)
+    return decorated
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def render(metrics):
+    """
+    Prometheus text exposition format (0.0.4) for `metrics`, a list of
+    (name, type, help, samples) where samples are (sample name, labels, value).
+    """
+    lines = []
+    for name, kind, documentation, samples in metrics:
+        lines.append(f'# HELP {name} {documentation}')
+        lines.append(f'# TYPE {name} {kind}')
+        for sample, labels, value in samples:
+            if labels:
+                label_text = ','.join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+                lines.append(f'{sample}{{{label_text}}} {value}')
+            else:
+                lines.append(f'{sample} {value}')
+    return '\n'.join(lines) + '\n'
+
+
+class Instrumentation:
+    """
+    Request and SQL instrumentation, exposed in Prometheus text format on METRICS_PATH.
+
+    Flask before_request/teardown_request hooks time each request per endpoint ('users.get_all_users',
+    'reviews.get_review_by_id', ...); teardown runs even after an unhandled exception, which is
+    counted as a 500. SQLAlchemy before/after_cursor_execute hooks time every
+    statement and count them per request. Code can attribute time to a named phase of the
+    request with phase_timer (JSON serialization and password hashing do).
+    Each worker process keeps its own numbers, so scrape every worker.
+    """
+    def __init__(self):
+        self.request_duration = Histogram(
+            'http_request_duration_seconds', 'Request latency by endpoint.', ('endpoint', 'method'))
+        self.requests = Counter(
+            'http_requests_total', 'Requests by endpoint and status code.', ('endpoint', 'method', 'status'))
+        self.request_statements = Histogram(
+            'http_request_db_statements', 'SQL statements executed per request.', ('endpoint',), COUNT_BUCKETS)
+        self.request_db_time = Histogram(
+            'http_request_db_seconds', 'Time spent in SQL statements per request.', ('endpoint',))
+        self.request_phases = Histogram(
+            'http_request_phase_seconds', 'Time spent in a named phase per request.', ('endpoint', 'phase'))
+        self.statement_duration = Histogram(
+            'db_statement_duration_seconds', 'SQL statement execution time.', ('bind',), STATEMENT_BUCKETS)
+
+    def init_app(self, app):
+        if not app.config.get('METRICS_ENABLED', True):
+            return
+        app.extensions['instrumentation'] = self
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+        with app.app_context():
+            for bind, engine in app.extensions['sqlalchemy'].engines.items():
+                self.instrument_engine(engine, bind or 'default')
+        app.add_url_rule(app.config.get('METRICS_PATH', '/metrics'), 'metrics', scrape_token_or_admin(self.expose))
+
+    def instrument_engine(self, engine, bind):
+        labels = (bind,)
+
+        @event.listens_for(engine, 'before_cursor_execute')
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault('_metrics_query_start', []).append(time.perf_counter())
+
+        @event.listens_for(engine, 'after_cursor_execute')
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            elapsed = time.perf_counter() - conn.info['_metrics_query_start'].pop()
+            self.statement_duration.observe(elapsed, labels)
+            state = g.get('_request_metrics') if has_request_context() else None
+            if state is not None:
+                state.statements += 1
+                state.db_seconds += elapsed
+
+        @event.listens_for(engine, 'handle_error')
+        def handle_error(context):
+            # after_cursor_execute doesn't fire for failed statements
+            starts = context.connection.info.get('_metrics_query_start') if context.connection is not None else None
+            if starts:
+                starts.pop()
+
+    def _before_request(self):
+        g._request_metrics = _RequestMetrics()
+
+    def _after_request(self, response):
+        state = g.get('_request_metrics')
+        if state is not None:
+            state.status = response.status_code
+        return response
+
+    def _teardown_request(self, exc):
+        state = g.pop('_request_metrics', None)
+        if state is None:
+            return
+        elapsed = time.perf_counter() - state.start
+        endpoint = request.endpoint or 'unmatched'
+        method = request.method
+        # No response was finalized when an exception escaped the request
+        status = state.status if state.status is not None else 500
+        self.request_duration.observe(elapsed, (endpoint, method))
+        self.requests.inc((endpoint, method, str(status)))
+        self.request_statements.observe(state.statements, (endpoint,))
+        self.request_db_time.observe(state.db_seconds, (endpoint,))
+        for phase, seconds in state.phases.items():
+            self.request_phases.observe(seconds, (endpoint, phase))
+
+    def _pool_metrics(self):
+        from app.utils.db_pool import pool_stats
+
+        stats = {
+            bind or 'default': pool_stats(engine)
+            for bind, engine in current_app.extensions['sqlalchemy'].engines.items()
+        }
+        gauges = [
+            ('db_pool_size', 'gauge', 'Configured pool size.', 'size'),
+            ('db_pool_checked_out', 'gauge', 'Connections currently checked out.', 'checked_out'),
+            ('db_pool_checked_in', 'gauge', 'Idle connections in the pool.', 'checked_in'),
+            ('db_pool_overflow', 'gauge', 'Connections open beyond the pool size.', 'overflow'),
+            ('db_pool_timeouts_total', 'counter', 'Checkouts that timed out.', 'timeouts'),
+        ]
+        metrics = [
+            (name, kind, documentation,
+             [(name, {'bind': bind}, values[key]) for bind, values in stats.items() if key in values])
+            for name, kind, documentation, key in gauges
+        ]
+        wait_samples = []
+        for bind, values in stats.items():
+            if 'wait_seconds' not in values:
+                continue
+            wait = values['wait_seconds']
+            for bound, count in wait['buckets'].items():
+                wait_samples.append(('db_pool_checkout_wait_seconds_bucket', {'bind': bind, 'le': bound}, count))
+            wait_samples.append(('db_pool_checkout_wait_seconds_sum', {'bind': bind}, wait['sum']))
+            wait_samples.append(('db_pool_checkout_wait_seconds_count', {'bind': bind}, wait['count']))
+        metrics.append(('db_pool_checkout_wait_seconds', 'histogram', 'Connection checkout wait time.', wait_samples))
+        return metrics
+
+    def expose(self):
+        metrics = [
+            (metric.name, metric.kind, metric.documentation, metric.samples())
+            for metric in (self.request_duration, self.requests, self.request_statements,
+                           self.request_db_time, self.request_phases, self.statement_duration)
+        ]
+        metrics.extend(self._pool_metrics())
+        return current_app.response_class(render(metrics), mimetype='text/plain; version=0.0.4')
@@ -0,0 +1,35 @@
+import click
+
+
+class _MigrateGroup(click.Group):
+    """
+    Placeholder for Flask-Migrate's `flask db` group. Running it (or asking for its help)
+    loads the real group, which then parses the arguments and runs the command.
+    """
+    def __init__(self, load, **kwargs):
+        super().__init__(**kwargs)
+        self._load = load
+
+    def make_context(self, info_name, args, parent=None, **extra):
+        return self._load().make_context(info_name, args, parent=parent, **extra)
+
+
+class LazyMigrate:
+    """
+    Flask-Migrate, imported only when a `flask db` command runs. It imports alembic, the
+    largest import in the app, and serving requests never needs it.
+    """
+    def __init__(self, directory='migrations', command='db', **kwargs):
+        self.directory = directory
+        self.command = command
+        self.kwargs = kwargs
+
+    def init_app(self, app, db):
+        def load():
+            if 'migrate' not in app.extensions:
+                from flask_migrate import Migrate
+
+                Migrate(app, db, directory=self.directory, command=self.command, **self.kwargs)
+            return app.cli.get_command(None, self.command)
+
+        app.cli.add_command(_MigrateGroup(load, name=self.command, help='Perform database migrations.'))
@@ -0,0 +1,84 @@
+import base64
+import json
+from datetime import datetime
+
+from flask import current_app
+
+
+def encode_cursor(created_at, row_id):
+    """
+    Build an opaque cursor from the (created_at, id) keyset of the last row on a page.
+    created_at is None for listings ordered by id alone.
+    """
+    created_at = created_at.isoformat() if created_at is not None else None
+    payload = json.dumps([created_at, row_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor produced by encode_cursor back into (created_at, id).
+    Raises ValueError when the cursor is malformed.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if created_at is not None:
+            created_at = datetime.fromisoformat(created_at)
+        return created_at, int(row_id)
+    except (TypeError, ValueError, UnicodeDecodeError):
+        raise ValueError('Invalid cursor')
+
+
+def parse_page_args(args):
+    """
+    Read `limit` and `after` from the request query string.
+    `limit` falls back to PAGINATION_DEFAULT_LIMIT and is capped at PAGINATION_MAX_LIMIT.
+    Raises ValueError on a non-numeric limit or a bad cursor.
+    """
+    default_limit = current_app.config['PAGINATION_DEFAULT_LIMIT']
+    max_limit = current_app.config['PAGINATION_MAX_LIMIT']
+
+    limit = args.get('limit', default_limit)
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        raise ValueError('limit must be an integer')
+    limit = max(1, min(limit, max_limit))
+
+    after = args.get('after')
+    if after:
+        after = decode_cursor(after)
+    return limit, after or None
+
+
+def keyset_page(query, created_col, id_col, limit, after=None):
+    """
+    Apply (created_at, id) keyset pagination to a query, or id-only pagination when
+    created_col is None.
+    Returns the rows for this page and the cursor for the next one (None on the last page).
+    """
+    if created_col is None:
+        if after:
+            query = query.filter(id_col > after[1])
+        query = query.order_by(id_col)
+    else:
+        if after:
+            after_created, after_id = after
+            # The leading >= gives the database an index range to start from; an OR on its
+            # own is walked from the first row by SQLite
+            query = query.filter(
+                (created_col >= after_created) &
+                ((created_col > after_created) | (id_col > after_id))
+            )
+        query = query.order_by(created_col, id_col)
+
+    # Fetch one extra row so we know whether another page exists without a COUNT(*)
+    rows = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        created_at = last.created_at if created_col is not None else None
+        next_cursor = encode_cursor(created_at, last.id)
+    return rows, next_cursor
@@ -0,0 +1,103 @@
+from contextlib import contextmanager
+from flask import current_app, g, has_request_context, request, session
+from flask_jwt_extended import get_jwt_identity
+from flask_sqlalchemy.session import Session
+from app.utils.cache import MemoryBackend, backend_from_config
+
+# SQLALCHEMY_BINDS key of the read replica
+REPLICA_BIND = 'replica'
+
+READ_METHODS = ('GET', 'HEAD')
+
+
+def _request_user_id():
+    try:
+        identity = get_jwt_identity()
+    except RuntimeError:
+        # No JWT verified for this request
+        identity = None
+    if isinstance(identity, dict):
+        return identity.get('user_id')
+    return session.get('_user_id')  # Flask-Login
+
+
+@contextmanager
+def read_from_primary():
+    """
+    Send the reads inside the block to the primary. Used when filling caches that outlive the
+    request, which must not be refilled with replica rows older than the write that cleared them.
+    """
+    if not has_request_context():
+        yield
+        return
+    depth = g.get('_primary_reads', 0)
+    g._primary_reads = depth + 1
+    try:
+        yield
+    finally:
+        g._primary_reads = depth
+
+
+class ReplicaRouter:
+    """
+    Decides, per request, whether db.session may read from the replica bind.
+
+    Only GET/HEAD requests read from the replica; other requests, CLI commands and anything
+    outside a request use the primary. A user whose request wrote to the primary keeps reading
+    from it for REPLICA_STICKY_SECONDS afterwards, so they see their own writes despite
+    replication lag. The memory backend only covers one process; use redis with several workers.
+    """
+    def __init__(self, backend=None):
+        self.backend = backend or MemoryBackend()
+        self.enabled = False
+        self.sticky_seconds = 5
+
+    def init_app(self, app):
+        self.enabled = REPLICA_BIND in app.config.get('SQLALCHEMY_BINDS', {})
+        self.sticky_seconds = app.config.get('REPLICA_STICKY_SECONDS', self.sticky_seconds)
+        self.backend = backend_from_config(app, 'REPLICA_STICKY', 'ratings:sticky:', 100000)
+        app.extensions['replica_router'] = self
+        app.after_request(self._remember_writer)
+
+    def allows_replica(self):
+        if not self.enabled or not has_request_context() or request.method not in READ_METHODS:
+            return False
+        if g.get('_primary_reads') or g.get('_wrote_primary'):
+            return False
+        if '_replica_allowed' not in g:
+            user_id = _request_user_id()
+            g._replica_allowed = user_id is None or self.backend.get(str(user_id)) is None
+        return g._replica_allowed
+
+    def record_write(self):
+        if has_request_context():
+            g._wrote_primary = True
+
+    def _remember_writer(self, response):
+        if self.enabled and g.get('_wrote_primary') and self.sticky_seconds > 0:
+            user_id = _request_user_id()
+            if user_id is not None:
+                self.backend.set(str(user_id), True, self.sticky_seconds)
+        return response
+
+
+class RoutingSession(Session):
+    """
+    db.session class that sends SELECTs to the replica bind when the ReplicaRouter allows it.
+    Flushes and DML go to the primary, and so does everything after them in the same session.
+    """
+    def __init__(self, db, **kwargs):
+        super().__init__(db, **kwargs)
+        self._pinned_to_primary = False
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None:
+            router = current_app.extensions.get('replica_router')
+            if self._flushing or (clause is not None and clause.is_dml):
+                self._pinned_to_primary = True
+                if router is not None:
+                    router.record_write()
+            elif (not self._pinned_to_primary and clause is not None and clause.is_select
+                    and router is not None and router.allows_replica()):
+                return self._db.engines[REPLICA_BIND]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
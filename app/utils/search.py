@@ -0,0 +1,109 @@
+import heapq
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def tokenize(text):
+    return [token.lower() for token in _TOKEN_RE.findall(text or '')]
+
+
+class InvertedIndex:
+    """
+    In-process full-text index used when the database has no FULLTEXT support (SQLite/tests).
+
+    It is built from the table on the first search and then kept current by ReviewDAL writes.
+    Until it is built, the write hooks are no-ops. Each process holds its own copy, so it is not
+    a substitute for the MySQL FULLTEXT index in multi-worker deployments.
+    Scoring is BM25 over the query terms (any term matches).
+    """
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings = None  # token -> {doc_id: term frequency}
+        self._lengths = {}  # doc_id -> token count
+        self._doc_tokens = {}  # doc_id -> distinct tokens, so removal only touches its own postings
+        self._total_length = 0
+
+    @property
+    def loaded(self):
+        return self._postings is not None
+
+    def build(self, documents):
+        """
+        Replace the index with `documents`, an iterable of (doc_id, text).
+        """
+        postings = defaultdict(dict)
+        lengths = {}
+        doc_tokens = {}
+        for doc_id, text in documents:
+            counts = Counter(tokenize(text))
+            for token, frequency in counts.items():
+                postings[token][doc_id] = frequency
+            lengths[doc_id] = sum(counts.values())
+            doc_tokens[doc_id] = tuple(counts)
+        with self._lock:
+            self._postings = postings
+            self._lengths = lengths
+            self._doc_tokens = doc_tokens
+            self._total_length = sum(lengths.values())
+
+    def invalidate(self):
+        with self._lock:
+            self._postings = None
+            self._lengths = {}
+            self._doc_tokens = {}
+            self._total_length = 0
+
+    def add(self, doc_id, text):
+        with self._lock:
+            if self._postings is None:
+                return
+            self._remove(doc_id)
+            counts = Counter(tokenize(text))
+            for token, frequency in counts.items():
+                self._postings[token][doc_id] = frequency
+            self._lengths[doc_id] = sum(counts.values())
+            self._doc_tokens[doc_id] = tuple(counts)
+            self._total_length += self._lengths[doc_id]
+
+    def remove(self, doc_id):
+        with self._lock:
+            if self._postings is not None:
+                self._remove(doc_id)
+
+    def _remove(self, doc_id):
+        length = self._lengths.pop(doc_id, None)
+        if length is None:
+            return
+        self._total_length -= length
+        for token in self._doc_tokens.pop(doc_id, ()):
+            del self._postings[token][doc_id]
+            if not self._postings[token]:
+                del self._postings[token]
+
+    def search(self, query, limit, offset=0):
+        """
+        Return up to `limit` doc ids ranked by relevance, skipping the first `offset`.
+        """
+        with self._lock:
+            documents = len(self._lengths)
+            if not documents:
+                return []
+            average_length = self._total_length / documents
+            scores = defaultdict(float)
+            for token in set(tokenize(query)):
+                docs = self._postings.get(token)
+                if not docs:
+                    continue
+                idf = math.log(1 + (documents - len(docs) + 0.5) / (len(docs) + 0.5))
+                for doc_id, frequency in docs.items():
+                    norm = self.k1 * (1 - self.b + self.b * self._lengths[doc_id] / average_length)
+                    scores[doc_id] += idf * frequency * (self.k1 + 1) / (frequency + norm)
+        ranked = heapq.nlargest(offset + limit, scores.items(), key=lambda item: (item[1], item[0]))
+        return [doc_id for doc_id, _ in ranked[offset:]]
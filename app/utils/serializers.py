@@ -0,0 +1,33 @@
+from json.encoder import encode_basestring
+from flask import current_app
+from app.utils.metrics import phase_timer
+
+# Column order of the row tuples produced by ReviewDAL's *_rows queries
+REVIEW_ROW_COLUMNS = ('id', 'content', 'rating', 'user_id', 'username', 'created_at')
+
+
+def review_row_json(row):
+    """
+    JSON text for one review row, in the same shape as Review.to_dict(), written straight
+    from the tuple without building a dict or an ORM object.
+    """
+    review_id, content, rating, user_id, username, created_at = row
+    return (
+        f'{{"id":{review_id},"content":{encode_basestring(content)},'
+        f'"rating":{"null" if rating is None else rating},"user_id":{user_id},'
+        f'"user":{{"id":{user_id},"username":{encode_basestring(username)}}},'
+        f'"created_at":"{created_at.isoformat()}"}}'
+    )
+
+
+@phase_timer('serialization')
+def json_list_response(key, fragments, **extra):
+    """
+    Response for {key: [...fragments], **extra} where fragments are already-encoded JSON values.
+    """
+    dumps = current_app.json.dumps
+    body = [f'{{"{key}":[', ','.join(fragments), ']']
+    for name, value in extra.items():
+        body.append(f',"{name}":{dumps(value)}')
+    body.append('}')
+    return current_app.response_class(''.join(body), mimetype='application/json')
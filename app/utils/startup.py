@@ -0,0 +1,16 @@
+import time
+
+
+class StartupTimer:
+    """
+    Wall time of each create_app phase in seconds, kept in app.extensions['startup_phases']
+    (see benchmarks/bench_coldstart.py). Each mark() closes the phase started by the previous one.
+    """
+    def __init__(self):
+        self.phases = {}
+        self._last = time.perf_counter()
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases[phase] = now - self._last
+        self._last = now
@@ -0,0 +1,105 @@
+import logging
+import threading
+import time
+from app.utils.cache import MemoryBackend, backend_from_config
+
+logger = logging.getLogger(__name__)
+
+
+class ExpiringMemoryBackend(MemoryBackend):
+    """
+    MemoryBackend that never evicts a live entry. When all max_entries are live, set()
+    drops the expired ones and, if that frees nothing, stores nothing and returns False.
+    """
+    def set(self, key, value, ttl):
+        now = time.monotonic()
+        with self._lock:
+            if key not in self._entries and len(self._entries) >= self.max_entries:
+                for expired in [k for k, (_, expires_at) in self._entries.items()
+                                if expires_at is not None and expires_at <= now]:
+                    del self._entries[expired]
+                if len(self._entries) >= self.max_entries:
+                    return False
+            self._entries[key] = (value, now + ttl if ttl else None)
+        return True
+
+
+class TokenBlocklist:
+    """
+    Revoked JWTs keyed by their jti. Each entry expires when the token itself would,
+    so the store only ever holds tokens that are still otherwise valid.
+
+    The memory backend is per process and holds at most JWT_BLOCKLIST_MAX_ENTRIES revocations.
+    It fails closed: when a revocation doesn't fit, every token issued up to then is refused
+    until the dropped one would have expired. So that one account logging in and out in a loop
+    can't fill it and log everybody out, a user gets at most JWT_BLOCKLIST_MAX_PER_USER live
+    entries; past that, only that user's tokens issued up to then are refused. Servers refuse
+    the memory backend with more than one worker; use the redis backend there.
+    """
+    def __init__(self, backend=None, max_per_user=None):
+        self.backend = backend or ExpiringMemoryBackend()
+        self.max_per_user = max_per_user
+        self._lock = threading.Lock()
+        # Set when a revocation couldn't be stored: (issued no later than, until)
+        self._refuse_issued_before = 0
+        self._refuse_until = 0
+        # Memory backend only: {user_id: [expiry of each live revocation]} and the users past
+        # max_per_user as {user_id: (issued no later than, until)}
+        self._user_revocations = {}
+        self._refused_users = {}
+
+    def init_app(self, app):
+        self.backend = backend_from_config(app, 'JWT_BLOCKLIST', 'ratings:jti:', 100000, ExpiringMemoryBackend)
+        # A shared store doesn't fill up, and a per-process count can't cap a user across workers
+        self.max_per_user = (app.config['JWT_BLOCKLIST_MAX_PER_USER']
+                             if isinstance(self.backend, ExpiringMemoryBackend) else None)
+        self._refuse_issued_before = self._refuse_until = 0
+        self._user_revocations = {}
+        self._refused_users = {}
+        app.extensions['token_blocklist'] = self
+
+    def _within_user_quota(self, user_id, now, expires_at):
+        with self._lock:
+            if len(self._user_revocations) >= self.backend.max_entries:
+                self._user_revocations = {user: expiries for user, expiries in self._user_revocations.items()
+                                          if max(expiries) > now}
+                self._refused_users = {user: refusal for user, refusal in self._refused_users.items()
+                                       if refusal[1] > now}
+            expiries = [expiry for expiry in self._user_revocations.get(user_id, ()) if expiry > now]
+            if len(expiries) >= self.max_per_user:
+                self._user_revocations[user_id] = expiries
+                until = max(self._refused_users.get(user_id, (0, 0))[1], expires_at)
+                self._refused_users[user_id] = (now, until)
+                return False
+            self._user_revocations[user_id] = expiries + [expires_at]
+            return True
+
+    def revoke(self, jti, expires_at, user_id=None):
+        """
+        Revoke a token until its `exp` timestamp.
+        """
+        now = time.time()
+        ttl = int(expires_at - now) + 1
+        if ttl <= 0:
+            return
+        if self.max_per_user and user_id is not None and not self._within_user_quota(user_id, now, expires_at):
+            logger.warning('User %s has %d live revoked tokens; refusing all of their tokens issued '
+                           'so far instead of storing another', user_id, self.max_per_user)
+            return
+        if self.backend.set(jti, True, ttl) is False:
+            with self._lock:
+                self._refuse_issued_before = now
+                self._refuse_until = max(self._refuse_until, expires_at)
+            logger.warning('Token blocklist is full (%d entries); refusing every token issued so far',
+                           self.backend.max_entries)
+
+    def is_revoked(self, jti, issued_at=None, user_id=None):
+        if self.backend.get(jti) is not None:
+            return True
+        now = time.time()
+        # A token whose revocation was dropped was issued before the drop and expires by the "until"
+        for issued_before, until in ((self._refuse_issued_before, self._refuse_until),
+                                     self._refused_users.get(user_id, (0, 0))):
+            if now < until and (issued_at is None or issued_at <= issued_before):
+                return True
+        return False
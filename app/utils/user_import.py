@@ -0,0 +1,82 @@
+import csv
+import json
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+
+def user_rows(items):
+    """
+    Validate bulk user items, given as (index, item). Returns (rows, errors) with rows as
+    (index, username, email, password, role_names) for UserDAL.bulk_create_users.
+    """
+    rows, errors = [], []
+    for index, item in items:
+        if not isinstance(item, dict) or not all(
+                isinstance(item.get(field), str) and item[field].strip() for field in ('username', 'email', 'password')):
+            errors.append({'index': index, 'message': 'Username, email and password are required'})
+            continue
+        roles = item.get('roles') or []
+        if not isinstance(roles, list) or not all(isinstance(name, str) for name in roles):
+            errors.append({'index': index, 'message': 'Roles must be a list of role names'})
+            continue
+        rows.append((index, item['username'], item['email'], item['password'], roles))
+    return rows, errors
+
+
+def _read_items(path):
+    """
+    (line number, item) for every user in a CSV file (header username,email,password,roles
+    with roles separated by ';') or an NDJSON file (one user object per line).
+    Lines that aren't valid JSON yield (line number, None).
+    """
+    with open(path, newline='', encoding='utf-8') as f:
+        if path.endswith('.csv'):
+            reader = csv.DictReader(f)
+            for item in reader:
+                roles = item.get('roles') or ''
+                item['roles'] = [name.strip() for name in roles.split(';') if name.strip()]
+                yield reader.line_num, item
+            return
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, json.loads(line)
+            except ValueError:
+                yield line_number, None
+
+
+@click.command('import-users')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--chunk-size', type=int, default=None,
+              help='Users per transaction (default BULK_INSERT_CHUNK_SIZE).')
+@with_appcontext
+def import_users_command(path, chunk_size):
+    """Create the users in a CSV or NDJSON file, skipping and reporting duplicates."""
+    from app.DAL.user_Dal import UserDAL
+
+    chunk_size = chunk_size or current_app.config['BULK_INSERT_CHUNK_SIZE']
+    inserted = rejected = 0
+
+    def flush(batch):
+        nonlocal inserted, rejected
+        rows, errors = user_rows([(index, item) for index, item in batch if item is not None])
+        errors.extend({'index': index, 'message': 'Invalid JSON'} for index, item in batch if item is None)
+        count, insert_errors = UserDAL.bulk_create_users(rows, chunk_size)
+        inserted += count
+        for error in sorted(errors + insert_errors, key=lambda error: error['index']):
+            rejected += 1
+            click.echo(f"line {error['index']}: {error['message']}", err=True)
+        click.echo(f'{inserted} created, {rejected} rejected')
+
+    batch = []
+    for line_number, item in _read_items(path):
+        batch.append((line_number, item))
+        if len(batch) == chunk_size:
+            flush(batch)
+            batch = []
+    if batch:
+        flush(batch)
+    if rejected:
+        raise click.ClickException(f'{rejected} user{"" if rejected == 1 else "s"} not imported')
@@ -0,0 +1,5 @@
+from app.asgi import create_asgi_app, uvicorn_workers
+from app.utils.backends import check_shared_backends
+
+app = create_asgi_app()
+check_shared_backends(app.flask_app, uvicorn_workers())
@@ -0,0 +1,74 @@
+"""
+Import-to-first-request time and memory of the app with the API docs built from docstrings,
+served from a precompiled spec file (SWAGGER_SPEC_FILE) and turned off (SWAGGER_ENABLED=false).
+
+Each mode runs in a fresh interpreter, so every import is paid again. It reports the time to
+import and build the app, the first request after that, the first /apispec_1.json request and
+the peak RSS. It runs against an in-memory SQLite database:
+    python benchmarks/bench_apidocs.py [runs]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = r'''
+import json, resource, sys, time
+start = time.perf_counter()
+from app import create_app
+from app.config.config import Config
+
+class BenchConfig(Config):
+    SECRET_KEY = 'bench-secret'
+    JWT_SECRET_KEY = 'bench-jwt-secret-0123456789abcdef'
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    SWAGGER_ENABLED = sys.argv[1] != 'disabled'
+    SWAGGER_SPEC_FILE = sys.argv[2] if sys.argv[1] == 'file' else None
+
+app = create_app(BenchConfig)
+if sys.argv[1] == 'export':
+    result = app.test_cli_runner().invoke(args=['export-apispec', sys.argv[2]])
+    sys.exit(result.exit_code)
+client = app.test_client()
+ready = time.perf_counter()
+client.get('/')
+first = time.perf_counter()
+spec = client.get('/apispec_1.json').status_code == 200 and time.perf_counter() - first
+print(json.dumps({
+    'startup': ready - start,
+    'first_request': first - ready,
+    'apispec': spec or None,
+    'rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    'flasgger': 'flasgger' in sys.modules,
+}))
+'''
+
+
+def run(mode, spec_file):
+    output = subprocess.check_output([sys.executable, '-c', CHILD, mode, spec_file], cwd=ROOT)
+    return json.loads(output)
+
+
+def main(runs=5):
+    spec_file = os.path.join(tempfile.mkdtemp(), 'apispec.json')
+    subprocess.check_call([sys.executable, '-c', CHILD, 'export', spec_file], cwd=ROOT)
+
+    print(f'median of {runs} runs')
+    print(f'{"mode":<10} {"startup ms":>11} {"1st req ms":>11} {"apispec ms":>11} {"RSS MB":>8} flasgger')
+    for mode in ('docstring', 'file', 'disabled'):
+        results = [run(mode, spec_file) for _ in range(runs)]
+        startup = statistics.median(r['startup'] for r in results) * 1000
+        first = statistics.median(r['first_request'] for r in results) * 1000
+        apispec = (f'{statistics.median(r["apispec"] for r in results) * 1000:>11.1f}'
+                   if results[0]['apispec'] else f'{"-":>11}')
+        rss = statistics.median(r['rss_mb'] for r in results)
+        print(f'{mode:<10} {startup:>11.1f} {first:>11.1f} {apispec} {rss:>8.1f} {results[0]["flasgger"]}')
+
+
+if __name__ == '__main__':
+    args = [int(arg) for arg in sys.argv[1:2]]
+    main(*args)
@@ -0,0 +1,110 @@
+"""
+Concurrency limits of the two serving modes under slow database I/O: the sync WSGI app
+with a fixed number of request threads, against the ASGI mode serving the same read
+endpoint on the event loop.
+
+Every SQL statement is delayed by a fixed latency, standing in for a slow or remote MySQL.
+The delay sleeps in the thread that runs the statement: a request thread in sync mode,
+aiosqlite's connection thread in async mode. Client and server share one process, so both
+modes top out at the same CPU-bound rate; keep the latency high enough that I/O dominates.
+It runs against a temporary SQLite file and needs aiosqlite and httpx:
+    python benchmarks/bench_asgi.py [latency_ms] [sync_threads]
+"""
+import asyncio
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from flask_jwt_extended import create_access_token
+from app import db
+from app.asgi import create_asgi_app
+from app.config.config import Config
+from app.seeds.seeds import seed_data
+
+LATENCY = 0.1
+CONCURRENCY = (16, 64, 256)
+POOL_SIZE = 256
+
+
+class SlowCursor(sqlite3.Cursor):
+    def execute(self, *args):
+        time.sleep(LATENCY)
+        return super().execute(*args)
+
+    def executemany(self, *args):
+        time.sleep(LATENCY)
+        return super().executemany(*args)
+
+
+class SlowConnection(sqlite3.Connection):
+    def cursor(self, factory=SlowCursor):
+        return super().cursor(factory)
+
+
+def bench_config(path, async_reads, sync_threads):
+    class BenchConfig(Config):
+        TESTING = True
+        SECRET_KEY = 'bench-secret'
+        JWT_SECRET_KEY = 'bench-jwt-secret-0123456789abcdef'
+        JWT_VERIFY_SUB = False
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+        SQLALCHEMY_ENGINE_OPTIONS = {
+            'pool_size': POOL_SIZE,
+            'max_overflow': 0,
+            'connect_args': {'factory': SlowConnection, 'check_same_thread': False},
+        }
+        ASGI_ASYNC_READS = async_reads
+        ASGI_SYNC_THREADS = sync_threads
+        METRICS_ENABLED = False
+    return BenchConfig
+
+
+async def measure(app, headers, concurrency, requests):
+    latencies = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://bench') as client:
+        async def one():
+            start = time.perf_counter()
+            response = await client.get('/api/users/1', headers=headers)
+            assert response.status_code == 200, response.text
+            latencies.append(time.perf_counter() - start)
+
+        await one()  # warm up the cache entry and a connection
+        latencies.clear()
+        start = time.perf_counter()
+        for offset in range(0, requests, concurrency):
+            await asyncio.gather(*(one() for _ in range(min(concurrency, requests - offset))))
+        elapsed = time.perf_counter() - start
+    latencies.sort()
+    return requests / elapsed, statistics.median(latencies), latencies[int(len(latencies) * 0.99) - 1]
+
+
+def main(latency_ms=100, sync_threads=16):
+    global LATENCY
+    LATENCY = latency_ms / 1000
+    path = os.path.join(tempfile.mkdtemp(), 'bench.db')
+
+    print(f'{latency_ms} ms per SQL statement; sync mode has {sync_threads} request threads')
+    print(f'{"mode":<6} {"concurrency":>11} {"req/s":>9} {"p50 ms":>9} {"p99 ms":>9}')
+    for mode in ('sync', 'async'):
+        app = create_asgi_app(bench_config(path, mode == 'async', sync_threads))
+        with app.flask_app.app_context():
+            if mode == 'sync':
+                db.create_all()
+                seed_data()
+            headers = {'Authorization': 'Bearer ' + create_access_token(
+                identity={'user_id': 1, 'role': 'Admin'}, additional_claims={'roles': ['Admin']})}
+        for concurrency in CONCURRENCY:
+            rate, p50, p99 = asyncio.run(measure(app, headers, concurrency, concurrency * 4))
+            print(f'{mode:<6} {concurrency:>11} {rate:>9.0f} {p50 * 1000:>9.0f} {p99 * 1000:>9.0f}')
+
+
+if __name__ == '__main__':
+    args = [int(arg) for arg in sys.argv[1:3]]
+    main(*args)
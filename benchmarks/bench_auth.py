@@ -0,0 +1,69 @@
+"""
+Per-request authorization overhead: the old stacked decorators
+login_required(token_required(admin_required(view))) against auth_required(admin=True)(view).
+
+Runs against an in-memory SQLite database:
+    python benchmarks/bench_auth.py [requests]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask_login import login_required
+from app import create_app, db
+from app.config.config import Config
+from app.seeds.seeds import seed_data
+from app.utils.jwtdecorator import admin_required, auth_required, token_required
+
+
+class BenchConfig(Config):
+    TESTING = True
+    SECRET_KEY = 'bench-secret'
+    JWT_SECRET_KEY = 'bench-jwt-secret-0123456789abcdef'
+    JWT_VERIFY_SUB = False
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    # Measure the decorators themselves, not the identity cache in front of the user_loader
+    IDENTITY_CACHE_TTL = 0
+
+
+def view():
+    return 'ok'
+
+
+def run(client, path, headers, requests):
+    client.get(path, headers=headers)  # warm up
+    start = time.perf_counter()
+    for _ in range(requests):
+        response = client.get(path, headers=headers)
+        assert response.status_code == 200, response.get_data(as_text=True)
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+def main(requests=2000):
+    app = create_app(BenchConfig)
+    app.add_url_rule('/bench/stacked', 'bench_stacked', login_required(token_required(admin_required(view))))
+    app.add_url_rule('/bench/combined', 'bench_combined', auth_required(admin=True)(view))
+    app.add_url_rule('/bench/none', 'bench_none', view)
+
+    with app.app_context():
+        db.create_all()
+        seed_data()
+
+    client = app.test_client()
+    response = client.post('/api/auth/login', json={'email': 'admin@example.com', 'password': 'adminpassword'})
+    headers = {'Authorization': 'Bearer ' + response.get_json()['access_token']}
+
+    baseline = run(client, '/bench/none', headers, requests)
+    stacked = run(client, '/bench/stacked', headers, requests)
+    combined = run(client, '/bench/combined', headers, requests)
+
+    print(f'requests per variant: {requests}')
+    print(f'no auth            {baseline:8.1f} us/request')
+    print(f'stacked decorators {stacked:8.1f} us/request  (+{stacked - baseline:.1f} us)')
+    print(f'auth_required      {combined:8.1f} us/request  (+{combined - baseline:.1f} us)')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
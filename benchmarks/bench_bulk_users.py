@@ -0,0 +1,71 @@
+"""
+User import cost: UserDAL.create_user once per user (a role query per role name, a hash on
+the request pool, a commit per user) against UserDAL.bulk_create_users (one role query,
+hashes on the bulk pool, executemany and a commit per chunk).
+
+The hash method is an argument because with the default scrypt the KDF dominates both sides;
+a cheap pbkdf2 shows the database overhead. Bulk hashing scales with PASSWORD_HASH_BULK_WORKERS
+up to the number of cores. It runs against a temporary SQLite file:
+    python benchmarks/bench_bulk_users.py [users] [hash_method]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event
+from app import create_app, db
+from app.DAL.user_Dal import UserDAL
+from app.config.config import Config
+from app.models.userRoleModel import User
+from app.seeds.seeds import seed_data
+
+
+def bench_config(path, hash_method):
+    class BenchConfig(Config):
+        TESTING = True
+        SECRET_KEY = 'bench-secret'
+        JWT_SECRET_KEY = 'bench-jwt-secret-0123456789abcdef'
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+        PASSWORD_HASH_METHOD = hash_method
+        METRICS_ENABLED = False
+    return BenchConfig
+
+
+def main(users=2000, hash_method='pbkdf2:sha256:1000'):
+    path = os.path.join(tempfile.mkdtemp(), 'bench.db')
+    app = create_app(bench_config(path, hash_method))
+    with app.app_context():
+        db.create_all()
+        seed_data()
+        statements = [0]
+        event.listen(db.engine, 'before_cursor_execute', lambda *args: statements.__setitem__(0, statements[0] + 1))
+
+        def user(prefix, i):
+            return f'{prefix}{i}', f'{prefix}{i}@example.com', 'password', ['User', 'Admin'] if i % 10 == 0 else ['User']
+
+        print(f'{users} users, {hash_method}, {app.config["PASSWORD_HASH_BULK_WORKERS"]} bulk hash threads')
+        print(f'{"method":<18} {"seconds":>9} {"users/s":>9} {"statements":>11}')
+
+        statements[0] = 0
+        start = time.perf_counter()
+        for i in range(users):
+            UserDAL.create_user(*user('single', i))
+        elapsed = time.perf_counter() - start
+        print(f'{"create_user":<18} {elapsed:>9.2f} {users / elapsed:>9.0f} {statements[0]:>11}')
+
+        statements[0] = 0
+        rows = [(i, *user('bulk', i)) for i in range(users)]
+        start = time.perf_counter()
+        inserted, errors = UserDAL.bulk_create_users(rows, app.config['BULK_INSERT_CHUNK_SIZE'])
+        elapsed = time.perf_counter() - start
+        assert inserted == users and not errors, errors
+        print(f'{"bulk_create_users":<18} {elapsed:>9.2f} {users / elapsed:>9.0f} {statements[0]:>11}')
+        assert db.session.scalar(db.select(db.func.count()).select_from(User)) == users * 2 + 2
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:3]
+    main(*([int(args[0])] + args[1:] if args else []))
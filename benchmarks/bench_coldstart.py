@@ -0,0 +1,95 @@
+"""
+Cold start of a fresh worker: what importing the app costs, module by module, and where
+create_app() spends its wall time.
+
+One run under `python -X importtime` attributes import time to modules. It lists the slowest
+modules by their own time and by cumulative time (with everything they import), and sums
+the own time per top-level package. The other runs are fresh interpreters without
+-X importtime. They report the median import time, the create_app() phases recorded in
+app.extensions['startup_phases'] and the first request. It runs against an in-memory
+SQLite database:
+    python benchmarks/bench_coldstart.py [runs] [top]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = r'''
+import json, time
+start = time.perf_counter()
+from app import create_app
+from app.config.config import Config
+imported = time.perf_counter()
+
+class BenchConfig(Config):
+    SECRET_KEY = 'bench-secret'
+    JWT_SECRET_KEY = 'bench-jwt-secret-0123456789abcdef'
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+
+app = create_app(BenchConfig)
+created = time.perf_counter()
+app.test_client().get('/')
+print(json.dumps({
+    'import': imported - start,
+    'create_app': created - imported,
+    'first_request': time.perf_counter() - created,
+    'phases': app.extensions['startup_phases'],
+}))
+'''
+
+
+def run(*flags):
+    return subprocess.run([sys.executable, *flags, '-c', CHILD], cwd=ROOT, capture_output=True, text=True, check=True)
+
+
+def import_times(stderr):
+    """
+    (module, own µs, cumulative µs) for each line of -X importtime output.
+    """
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        modules.append((name.strip(), int(own), int(cumulative)))
+    return modules
+
+
+def main(runs=5, top=15):
+    modules = import_times(run('-X', 'importtime').stderr)
+    by_own = sorted(modules, key=lambda module: module[1], reverse=True)[:top]
+    by_cumulative = sorted(modules, key=lambda module: module[2], reverse=True)[:top]
+    packages = {}
+    for name, own, _ in modules:
+        package = name.split('.')[0]
+        packages[package] = packages.get(package, 0) + own
+
+    print(f'-X importtime: {len(modules)} modules, {sum(own for _, own, _ in modules) / 1000:.1f} ms')
+    print(f'\n{"package":<32} {"own ms":>8}')
+    for package, own in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]:
+        print(f'{package:<32} {own / 1000:>8.1f}')
+    print(f'\n{"module (own time)":<48} {"own ms":>8}')
+    for name, own, _ in by_own:
+        print(f'{name:<48} {own / 1000:>8.1f}')
+    print(f'\n{"module (cumulative time)":<48} {"cum ms":>8}')
+    for name, _, cumulative in by_cumulative:
+        print(f'{name:<48} {cumulative / 1000:>8.1f}')
+
+    results = [json.loads(run().stdout) for _ in range(runs)]
+    print(f'\nmedian of {runs} fresh processes, ms')
+    rows = [('import app', 'import'), ('create_app()', 'create_app')]
+    for label, key in rows:
+        print(f'{label:<32} {statistics.median(r[key] for r in results) * 1000:>8.1f}')
+    for phase in results[0]['phases']:
+        median = statistics.median(r['phases'][phase] for r in results)
+        print(f'  {phase:<30} {median * 1000:>8.1f}')
+    print(f'{"first request":<32} {statistics.median(r["first_request"] for r in results) * 1000:>8.1f}')
+
+
+if __name__ == '__main__':
+    args = [int(arg) for arg in sys.argv[1:3]]
+    main(*args)
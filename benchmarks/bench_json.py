@@ -0,0 +1,87 @@
+"""
+Review list serialization: ORM objects + to_dict() + each JSON provider, against row tuples
+written directly by review_row_json.
+
+Runs against an in-memory SQLite database:
+    python benchmarks/bench_json.py [rows] [repeat]
+"""
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app, db
+from app.config.config import Config
+from app.DAL.review_Dal import ReviewDAL
+from app.models.reviewModel import Review
+from app.models.userRoleModel import User
+from app.utils.json_provider import CompactJSONProvider, OrjsonProvider, orjson
+from app.utils.serializers import json_list_response, review_row_json
+from flask.json.provider import DefaultJSONProvider
+
+
+class BenchConfig(Config):
+    TESTING = True
+    SECRET_KEY = 'bench-secret'
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+
+
+def seed(rows):
+    users = [User(id=i, username=f'user{i}', email=f'user{i}@example.com', password_hash='x') for i in range(1, 51)]
+    db.session.add_all(users)
+    start = datetime(2024, 1, 1)
+    db.session.execute(db.insert(Review), [
+        {'content': f'Review number {i} with a few words of text, quotes "like this" and ünïcødé.',
+         'rating': i % 5 + 1, 'user_id': i % 50 + 1, 'created_at': start + timedelta(seconds=i)}
+        for i in range(rows)
+    ])
+    db.session.commit()
+
+
+def timed(fn, repeat):
+    fn()  # warm up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main(rows=5000, repeat=20):
+    app = create_app(BenchConfig)
+    with app.app_context(), app.test_request_context():
+        db.create_all()
+        seed(rows)
+
+        def orm_page(provider):
+            def run():
+                db.session.expunge_all()
+                reviews, next_cursor = ReviewDAL.list_reviews(rows)
+                return provider.response({'reviews': [review.to_dict() for review in reviews], 'next_cursor': next_cursor})
+            return run
+
+        def row_page():
+            db.session.expunge_all()
+            result, next_cursor = ReviewDAL.list_review_rows(rows)
+            return json_list_response('reviews', map(review_row_json, result), next_cursor=next_cursor)
+
+        variants = [
+            ('ORM + to_dict + Flask default provider (old path)', orm_page(DefaultJSONProvider(app))),
+            ('ORM + to_dict + compact provider', orm_page(CompactJSONProvider(app))),
+        ]
+        if orjson is not None:
+            variants.append(('ORM + to_dict + orjson provider', orm_page(OrjsonProvider(app))))
+        variants.append(('row tuples + review_row_json', row_page))
+
+        print(f'{rows} reviews per page, {repeat} repeats, query + serialization')
+        baseline = None
+        for label, fn in variants:
+            ms = timed(fn, repeat)
+            baseline = baseline or ms
+            print(f'{label:<52} {ms:8.1f} ms  ({baseline / ms:.2f}x)')
+
+
+if __name__ == '__main__':
+    args = [int(arg) for arg in sys.argv[1:3]]
+    main(*args)
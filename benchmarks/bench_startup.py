@@ -0,0 +1,122 @@
+"""
+Gunicorn startup time and per-worker memory, with and without preload_app.
+
+Starts gunicorn with gunicorn.conf.py for each setting and reports the time until the first
+response, the CPU time all processes spent starting, and each process's RSS and PSS.
+PSS splits pages shared copy-on-write between the processes using them, so it shows what
+preloading saves. Linux only (reads /proc). It runs against a temporary SQLite file:
+    python benchmarks/bench_startup.py [workers]
+"""
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+PORT = 8765
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK')
+
+
+def bench_app():
+    """
+    App factory gunicorn loads: the normal app on the SQLite file named by BENCH_DATABASE.
+    """
+    from app import create_app
+    from app.config.config import Config
+    from app.utils.cache import NullBackend
+
+    class BenchConfig(Config):
+        SECRET_KEY = 'bench-secret'
+        JWT_SECRET_KEY = 'bench-jwt-secret-0123456789abcdef'
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.environ['BENCH_DATABASE']}"
+        # Several workers refuse a per-process blocklist; nothing here logs out
+        JWT_BLOCKLIST_BACKEND = NullBackend()
+
+    return create_app(BenchConfig)
+
+
+def children(pid):
+    with open(f'/proc/{pid}/task/{pid}/children') as f:
+        return [int(child) for child in f.read().split()]
+
+
+def memory_kb(pid):
+    values = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            name, _, rest = line.partition(':')
+            if name in ('Rss', 'Pss'):
+                values[name] = int(rest.split()[0])
+    return values['Rss'], values['Pss']
+
+
+def cpu_seconds(pid):
+    with open(f'/proc/{pid}/stat') as f:
+        fields = f.read().rsplit(')', 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+
+
+def wait_for_response(deadline):
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{PORT}/', timeout=1) as response:
+                if response.status == 200:
+                    return
+        except OSError:
+            time.sleep(0.01)
+    raise RuntimeError('gunicorn did not start')
+
+
+def run(preload, workers, database):
+    env = dict(os.environ, BENCH_DATABASE=database, GUNICORN_PRELOAD=str(preload).lower(),
+               WEB_CONCURRENCY=str(workers), GUNICORN_BIND=f'127.0.0.1:{PORT}', GUNICORN_ACCESS_LOG='')
+    start = time.monotonic()
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'benchmarks.bench_startup:bench_app()'],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_for_response(start + 60)
+        first_response = time.monotonic() - start
+        while len(children(server.pid)) < workers:
+            time.sleep(0.05)
+        # Let every worker finish loading (without preload each imports the app itself)
+        time.sleep(3)
+        worker_pids = children(server.pid)
+        startup_cpu = cpu_seconds(server.pid) + sum(cpu_seconds(pid) for pid in worker_pids)
+        master = memory_kb(server.pid)
+        worker_memory = [memory_kb(pid) for pid in worker_pids]
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(30)
+
+    label = 'preload' if preload else 'no preload'
+    print(f'{label}: first response after {first_response:.2f}s, {startup_cpu:.2f} CPU-s spent starting')
+    print(f'  master    RSS {master[0] / 1024:6.1f} MB  PSS {master[1] / 1024:6.1f} MB')
+    for index, (rss, pss) in enumerate(worker_memory):
+        print(f'  worker {index}  RSS {rss / 1024:6.1f} MB  PSS {pss / 1024:6.1f} MB')
+    total_pss = master[1] + sum(pss for _, pss in worker_memory)
+    print(f'  total PSS {total_pss / 1024:.1f} MB')
+
+
+def main(workers=4):
+    database = os.path.join(tempfile.mkdtemp(), 'bench.db')
+    os.environ['BENCH_DATABASE'] = database
+    app = bench_app()
+    from app import db
+    from app.seeds.seeds import seed_data
+    with app.app_context():
+        db.create_all()
+        seed_data()
+
+    for preload in (False, True):
+        run(preload, workers, database)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:2]])
@@ -0,0 +1,65 @@
+"""
+Gunicorn settings for wsgi:app. Every value can be overridden from the environment.
+
+The app is imported and built once in the master (preload_app) and forked into the workers,
+which share its memory pages copy-on-write. The SQLAlchemy pools are emptied after fork
+so no two processes ever use the same database socket.
+
+Reloading:
+  kill -HUP <master>   restarts the workers gracefully (finishing in-flight requests within
+                       graceful_timeout). With preload_app they are forked from the already
+                       loaded app, so this does not pick up new code.
+  kill -USR2 <master>  starts a new master running the new code next to the old one; then
+                       kill -QUIT the old master once the new workers are serving.
+"""
+import multiprocessing
+import os
+
+wsgi_app = 'wsgi:app'
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:8000')
+
+# Threaded workers: requests mostly wait on MySQL. Keep workers * DB_POOL_SIZE (plus
+# overflow) under MySQL's max_connections, and threads at or below DB_POOL_SIZE.
+worker_class = 'gthread'
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.getenv('GUNICORN_THREADS', 4))
+preload_app = os.getenv('GUNICORN_PRELOAD', 'true').lower() in ('1', 'true', 'yes')
+
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+
+# Recycle workers now and then so slow leaks can't grow without bound; the jitter keeps
+# them from all restarting at once
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 10000))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', 1000))
+
+# Empty disables the access log
+accesslog = os.getenv('GUNICORN_ACCESS_LOG', '-') or None
+
+
+def _loaded_app(server):
+    # Only set in the master when preload_app built the app before forking
+    app = server.app.callable
+    return app if hasattr(app, 'app_context') else None
+
+
+def when_ready(server):
+    app = _loaded_app(server)
+    if app is not None:
+        # Anything the master connected while loading is of no use to it once workers serve
+        from app.utils.db_pool import dispose_engines
+        dispose_engines(app)
+
+
+def post_worker_init(worker):
+    # Runs with or without preload_app; raising here stops gunicorn with "Worker failed to boot"
+    from app.utils.backends import check_shared_backends
+    check_shared_backends(worker.wsgi, worker.cfg.workers)
+
+
+def post_fork(server, worker):
+    app = _loaded_app(server)
+    if app is not None:
+        from app.utils.db_pool import dispose_engines
+        dispose_engines(app, close=False)
@@ -0,0 +1,42 @@
+"""Add updated_at to reviews, users and roles for conditional GET
+
+Revision ID: a9d5e3c7f2b4
+Revises: f4c1a9e7b3d5
+Create Date: 2026-10-18 13:05:18.226471
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+# Microseconds on MySQL, so two writes within a second still change the row's version
+VERSION_TIMESTAMP = sa.DateTime().with_variant(mysql.DATETIME(fsp=6), 'mysql')
+
+
+# revision identifiers, used by Alembic.
+revision = 'a9d5e3c7f2b4'
+down_revision = 'f4c1a9e7b3d5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    for table in ('reviews', 'users', 'roles'):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('updated_at', VERSION_TIMESTAMP, nullable=True))
+
+    op.execute("UPDATE reviews SET updated_at = created_at")
+    op.execute("UPDATE users SET updated_at = COALESCE(created_at, CURRENT_TIMESTAMP)")
+    op.execute("UPDATE roles SET updated_at = CURRENT_TIMESTAMP")
+
+    for table in ('reviews', 'users', 'roles'):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.alter_column('updated_at',
+                   existing_type=VERSION_TIMESTAMP,
+                   nullable=False)
+
+
+def downgrade():
+    for table in ('roles', 'users', 'reviews'):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_column('updated_at')
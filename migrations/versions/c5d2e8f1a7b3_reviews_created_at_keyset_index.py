@@ -0,0 +1,34 @@
+"""Add (created_at, id) index on reviews for keyset pagination
+
+Revision ID: c5d2e8f1a7b3
+Revises: b39a2ab043d1
+Create Date: 2026-10-18 09:12:31.402117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5d2e8f1a7b3'
+down_revision = 'b39a2ab043d1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Rows without a timestamp can't be placed in the keyset order, so backfill them first
+    op.execute("UPDATE reviews SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL")
+    with op.batch_alter_table('reviews', schema=None) as batch_op:
+        batch_op.alter_column('created_at',
+               existing_type=sa.DateTime(),
+               nullable=False)
+        batch_op.create_index('ix_reviews_created_at_id', ['created_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('reviews', schema=None) as batch_op:
+        batch_op.drop_index('ix_reviews_created_at_id')
+        batch_op.alter_column('created_at',
+               existing_type=sa.DateTime(),
+               nullable=True)
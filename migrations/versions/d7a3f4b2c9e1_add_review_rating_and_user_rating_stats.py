@@ -0,0 +1,41 @@
+"""Add reviews.rating and the user_rating_stats aggregate table
+
+Revision ID: d7a3f4b2c9e1
+Revises: c5d2e8f1a7b3
+Create Date: 2026-10-18 11:04:52.118630
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd7a3f4b2c9e1'
+down_revision = 'c5d2e8f1a7b3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('reviews', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('rating', sa.SmallInteger(), nullable=True))
+
+    # Existing reviews have no rating, so the aggregates start empty
+    op.create_table('user_rating_stats',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('rating_count', sa.Integer(), nullable=False),
+    sa.Column('rating_sum', sa.Integer(), nullable=False),
+    sa.Column('count_1', sa.Integer(), nullable=False),
+    sa.Column('count_2', sa.Integer(), nullable=False),
+    sa.Column('count_3', sa.Integer(), nullable=False),
+    sa.Column('count_4', sa.Integer(), nullable=False),
+    sa.Column('count_5', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+
+def downgrade():
+    op.drop_table('user_rating_stats')
+    with op.batch_alter_table('reviews', schema=None) as batch_op:
+        batch_op.drop_column('rating')
@@ -0,0 +1,27 @@
+"""Add (user_id, created_at, id) index on reviews
+
+Revision ID: e2b8c6d4a1f7
+Revises: d7a3f4b2c9e1
+Create Date: 2026-10-18 11:47:09.530244
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2b8c6d4a1f7'
+down_revision = 'd7a3f4b2c9e1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # (created_at, id) was added with keyset pagination in c5d2e8f1a7b3
+    with op.batch_alter_table('reviews', schema=None) as batch_op:
+        batch_op.create_index('ix_reviews_user_id_created_at_id', ['user_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('reviews', schema=None) as batch_op:
+        batch_op.drop_index('ix_reviews_user_id_created_at_id')
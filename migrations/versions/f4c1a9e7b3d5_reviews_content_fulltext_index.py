@@ -0,0 +1,27 @@
+"""Add FULLTEXT index on reviews.content
+
+Revision ID: f4c1a9e7b3d5
+Revises: e2b8c6d4a1f7
+Create Date: 2026-10-18 12:26:40.871935
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f4c1a9e7b3d5'
+down_revision = 'e2b8c6d4a1f7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # MySQL only; other backends search through the in-process index
+    if op.get_bind().dialect.name == 'mysql':
+        op.create_index('ix_reviews_content_fulltext', 'reviews', ['content'], unique=False, mysql_prefix='FULLTEXT')
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'mysql':
+        op.drop_index('ix_reviews_content_fulltext', table_name='reviews')
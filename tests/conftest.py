@@ -0,0 +1,103 @@
+from contextlib import contextmanager
+import pytest
+from sqlalchemy import event
+from app import create_app, db
+from app.DAL.role_Dal import RoleDAL
+from app.config.config import Config
+from app.config.connector import review_search_index
+from app.seeds.seeds import seed_data
+
+
+class TestConfig(Config):
+    TESTING = True
+    SECRET_KEY = 'test-secret'
+    JWT_SECRET_KEY = 'test-jwt-secret-0123456789abcdef'
+    JWT_VERIFY_SUB = False
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    # A cheap KDF keeps the seeded logins fast
+    PASSWORD_HASH_METHOD = 'pbkdf2:sha256:1000'
+    SWAGGER_ENABLED = False
+
+
+class LocalRedis:
+    """
+    Stand-in for a redis-py client shared by several workers: the get/set/delete that
+    RedisBackend uses, on a dict. Expiry is ignored.
+    """
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value, ex=None):
+        self.values[key] = value.encode() if isinstance(value, str) else value
+
+    def delete(self, *keys):
+        for key in keys:
+            self.values.pop(key, None)
+
+
+@pytest.fixture
+def config_class():
+    return TestConfig
+
+
+def create_database():
+    # Module-level caches outlive the previous test's database
+    RoleDAL.invalidate_roles_cache()
+    review_search_index.invalidate()
+    db.create_all()
+    seed_data()
+
+
+@pytest.fixture
+def app(config_class):
+    app = create_app(config_class)
+    with app.app_context():
+        create_database()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def login(client, email, password):
+    response = client.post('/api/auth/login', json={'email': email, 'password': password})
+    assert response.status_code == 200, response.get_data(as_text=True)
+    return {'Authorization': 'Bearer ' + response.get_json()['access_token']}
+
+
+@pytest.fixture
+def admin_headers(client):
+    return login(client, 'admin@example.com', 'adminpassword')
+
+
+@pytest.fixture
+def user_headers(client):
+    return login(client, 'user@example.com', 'userpassword')
+
+
+@pytest.fixture
+def count_statements():
+    """
+    Context manager counting the SQL statements sent on an engine (db.engine by default).
+    """
+    @contextmanager
+    def counter(engine=None):
+        engine = engine or db.engine
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, 'before_cursor_execute', record)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, 'before_cursor_execute', record)
+    return counter
@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.mark.parametrize('path', ['/api/users/2/reviews', '/api/users/2/ratings'])
+def test_admin_only_user_endpoints(client, admin_headers, user_headers, path):
+    assert client.get(path, headers=user_headers).status_code == 403
+    assert client.get(path, headers=admin_headers).status_code == 200
@@ -0,0 +1,107 @@
+import asyncio
+import json
+import httpx
+import pytest
+from app import db
+from app.asgi import create_asgi_app, uvicorn_workers
+from app.utils.backends import check_shared_backends
+from tests.conftest import TestConfig, create_database
+
+
+class ThreadPoolConfig(TestConfig):
+    ASGI_ASYNC_READS = False
+
+
+@pytest.fixture
+def asgi_app():
+    asgi_app = create_asgi_app(ThreadPoolConfig)
+    with asgi_app.flask_app.app_context():
+        create_database()
+        yield asgi_app
+        db.session.remove()
+        db.drop_all()
+
+
+def post_login(asgi_app, content, headers=None):
+    async def post():
+        transport = httpx.ASGITransport(app=asgi_app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+            return await client.post('/api/auth/login', content=content,
+                                     headers={'Content-Type': 'application/json', **(headers or {})})
+    return asyncio.run(post())
+
+
+CREDENTIALS = json.dumps({'email': 'user@example.com', 'password': 'userpassword'}).encode()
+
+
+def test_body_with_content_length(asgi_app):
+    assert post_login(asgi_app, CREDENTIALS).status_code == 200
+
+
+def test_chunked_body(asgi_app):
+    async def chunks():
+        yield CREDENTIALS[:10]
+        yield CREDENTIALS[10:]
+
+    response = post_login(asgi_app, chunks())
+    assert response.request.headers['Transfer-Encoding'] == 'chunked'
+    assert response.status_code == 200, response.text
+
+
+@pytest.fixture
+def async_asgi_app(tmp_path):
+    class AsyncReadsConfig(TestConfig):
+        # A file, so the async engine (aiosqlite) and the sync one open the same database
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{tmp_path / "ratings.db"}'
+        ASGI_ASYNC_READS = True
+
+    asgi_app = create_asgi_app(AsyncReadsConfig)
+    with asgi_app.flask_app.app_context():
+        create_database()
+    yield asgi_app
+    asyncio.run(asgi_app.engine.dispose())
+    with asgi_app.flask_app.app_context():
+        db.engine.dispose()
+
+
+def test_get_runs_on_the_async_engine(async_asgi_app, count_statements):
+    login = post_login(async_asgi_app, json.dumps({'email': 'admin@example.com', 'password': 'adminpassword'}))
+    headers = {'Authorization': 'Bearer ' + login.json()['access_token']}
+
+    async def get():
+        transport = httpx.ASGITransport(app=async_asgi_app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+            return await client.get('/api/users/2', headers=headers)
+
+    assert async_asgi_app._is_async({'method': 'GET', 'path': '/api/users/2'})
+    with async_asgi_app.flask_app.app_context():
+        sync_engine = db.engine
+    with count_statements(sync_engine) as sync_statements, \
+            count_statements(async_asgi_app.engine.sync_engine) as async_statements:
+        response = asyncio.run(get())
+    assert response.status_code == 200, response.text
+    assert response.json()['email'] == 'user@example.com'
+    # run_sync's session served every query of the view; the sync engine wasn't touched
+    assert any('FROM users' in statement for statement in async_statements)
+    assert sync_statements == []
+
+
+@pytest.mark.parametrize('argv, environ, workers', [
+    (['/usr/local/bin/uvicorn', 'asgi:app', '--workers', '4'], {}, 4),
+    (['/usr/lib/python3/site-packages/uvicorn/__main__.py', 'asgi:app', '--workers=3'], {}, 3),
+    (['/usr/local/bin/uvicorn', 'asgi:app'], {'WEB_CONCURRENCY': '2'}, 2),
+    (['/usr/local/bin/uvicorn', 'asgi:app'], {}, 1),
+    (['/usr/local/bin/hypercorn', 'asgi:app', '--workers', '4'], {}, 1),
+])
+def test_uvicorn_workers(monkeypatch, argv, environ, workers):
+    monkeypatch.setattr('sys.argv', argv)
+    monkeypatch.delenv('WEB_CONCURRENCY', raising=False)
+    for name, value in environ.items():
+        monkeypatch.setenv(name, value)
+    assert uvicorn_workers() == workers
+
+
+def test_several_uvicorn_workers_refuse_the_memory_blocklist(asgi_app, monkeypatch):
+    monkeypatch.setattr('sys.argv', ['/usr/local/bin/uvicorn', 'asgi:app', '--workers', '4'])
+    with pytest.raises(RuntimeError, match='JWT_BLOCKLIST_BACKEND'):
+        check_shared_backends(asgi_app.flask_app, uvicorn_workers())
@@ -0,0 +1,39 @@
+from sqlalchemy.exc import OperationalError
+from app import db
+from app.DAL.review_Dal import ReviewDAL
+from app.DAL.user_Dal import UserDAL
+from app.models.reviewModel import Review
+from app.utils.bulk_insert import insert_in_chunks
+
+
+def test_failed_chunk_only_loses_its_own_rows(app):
+    def insert(chunk, errors):
+        if chunk[0][0] == 2:
+            raise OperationalError('INSERT', {}, Exception('connection lost'))
+        db.session.execute(db.insert(Review), [{'content': content, 'user_id': 1} for _, content in chunk])
+        return len(chunk)
+
+    rows = [(index, f'review {index}') for index in range(5)]
+    inserted, errors = insert_in_chunks(rows, 2, insert)
+    assert inserted == 3
+    assert [error['index'] for error in errors] == [2, 3]
+    assert db.session.scalar(db.select(db.func.count()).select_from(Review)) == 3
+
+
+def test_bulk_reviews_report_unknown_users(app):
+    inserted, errors = ReviewDAL.bulk_create_reviews([(0, 'ok', 1, 5), (1, 'nobody', 999, 4), (2, 'ok', 2, None)], 2)
+    assert inserted == 2
+    assert errors == [{'index': 1, 'message': 'User 999 does not exist'}]
+
+
+def test_bulk_users_skip_taken_and_duplicate_rows(app):
+    rows = [
+        (0, 'new1', 'new1@example.com', 'password', ['User']),
+        (1, 'taken', 'admin@example.com', 'password', ['User']),
+        (2, 'new1', 'other@example.com', 'password', ['User']),
+        (3, 'new2', 'new2@example.com', 'password', ['Admin', 'User']),
+    ]
+    inserted, errors = UserDAL.bulk_create_users(rows, 2)
+    assert inserted == 2
+    assert sorted(error['index'] for error in errors) == [1, 2]
+    assert sorted(role.name for role in UserDAL.get_user_by_email('new2@example.com').roles) == ['Admin', 'User']
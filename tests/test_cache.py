@@ -0,0 +1,68 @@
+import gzip
+import pytest
+from app import db
+from app.models.reviewModel import Review
+from app.utils.backends import check_shared_backends
+from app.utils.cache import Cache, MemoryBackend, RedisBackend
+from tests.conftest import LocalRedis, TestConfig
+from tests.test_conditional import body, write_elsewhere
+
+shared = LocalRedis()
+
+
+class SharedCacheConfig(TestConfig):
+    CACHE_BACKEND = RedisBackend(shared)
+    JWT_BLOCKLIST_BACKEND = RedisBackend(LocalRedis(), prefix='ratings:jti:')
+    COMPRESS_MIN_SIZE = 0
+
+
+@pytest.fixture
+def config_class():
+    shared.values.clear()
+    return SharedCacheConfig
+
+
+@pytest.fixture
+def review(app):
+    review = Review(content='v1', user_id=2, rating=3)
+    db.session.add(review)
+    db.session.commit()
+    return review.id
+
+
+def test_redis_backend_round_trips_json_and_bytes():
+    backend = RedisBackend(LocalRedis())
+    backend.set('json', {'id': 1, 'content': 'v1'}, 60)
+    backend.set('bytes', gzip.compress(b'{}'), 60)
+    assert backend.get('json') == {'id': 1, 'content': 'v1'}
+    assert gzip.decompress(backend.get('bytes')) == b'{}'
+    backend.delete('json')
+    assert backend.get('json') is None
+
+
+def test_review_is_cached_in_the_shared_backend(client, admin_headers, review):
+    response = client.get(f'/api/review/{review}', headers=admin_headers)
+    assert response.status_code == 200
+    assert any(key.startswith('ratings:reviews:') for key in shared.values)
+
+
+@pytest.mark.parametrize('encoding', ['identity', 'gzip'])
+def test_write_by_another_worker_is_served_from_the_shared_backend(client, admin_headers, review, encoding):
+    headers = dict(admin_headers, **{'Accept-Encoding': encoding})
+    assert 'v1' in body(client.get(f'/api/review/{review}', headers=headers))
+    write_elsewhere(Review, review, content='v2')
+    assert 'v2' in body(client.get(f'/api/review/{review}', headers=headers))
+
+
+def test_memory_backend_is_accepted_with_several_workers(app):
+    # Versioned keys: a per-process copy can't serve a body older than its row
+    app.extensions['cache'] = Cache(MemoryBackend())
+    check_shared_backends(app, 2)
+
+
+@pytest.mark.parametrize('path', ['/api/review/1', '/api/users/1', '/api/roles/2'])
+def test_cache_hit_only_queries_the_version(client, admin_headers, review, count_statements, path):
+    client.get(path, headers=admin_headers)
+    with count_statements() as statements:
+        assert client.get(path, headers=admin_headers).status_code == 200
+    assert len(statements) == 1
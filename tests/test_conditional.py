@@ -0,0 +1,138 @@
+import gzip
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy.dialects import mysql
+from sqlalchemy.schema import CreateTable
+from app import db
+from app.models.reviewModel import Review
+from app.models.userRoleModel import Role, User
+from tests.conftest import TestConfig
+
+
+class CompressedConfig(TestConfig):
+    COMPRESS_MIN_SIZE = 0
+
+
+@pytest.fixture
+def config_class():
+    return CompressedConfig
+
+
+@pytest.fixture
+def review(app):
+    review = Review(content='v1', user_id=2, rating=3)
+    db.session.add(review)
+    db.session.commit()
+    return review.id
+
+
+def later():
+    return datetime.now() + timedelta(seconds=5)
+
+
+def write_elsewhere(model, row_id, **values):
+    # A write made by another worker: it changes the row but not this process's cache
+    db.session.execute(db.update(model).where(model.id == row_id).values(updated_at=later(), **values))
+    db.session.commit()
+
+
+def body(response):
+    if response.headers.get('Content-Encoding') == 'gzip':
+        return gzip.decompress(response.get_data()).decode()
+    return response.get_data(as_text=True)
+
+
+@pytest.mark.parametrize('encoding', ['identity', 'gzip'])
+def test_review_body_follows_etag_after_write_elsewhere(client, admin_headers, review, encoding):
+    headers = {**admin_headers, 'Accept-Encoding': encoding}
+    first = client.get(f'/api/review/{review}', headers=headers)
+    assert 'v1' in body(first)
+
+    write_elsewhere(Review, review, content='v2')
+    second = client.get(f'/api/review/{review}', headers=headers)
+    assert second.status_code == 200
+    assert second.headers['ETag'] != first.headers['ETag']
+    assert 'v2' in body(second)
+
+    revalidated = client.get(f'/api/review/{review}', headers={**headers, 'If-None-Match': second.headers['ETag']})
+    assert revalidated.status_code == 304
+
+
+def test_two_writes_in_the_same_second_change_the_etag(client, admin_headers, review):
+    second = datetime.now().replace(microsecond=0) + timedelta(seconds=5)
+    etags = []
+    for microsecond, content in ((1, 'v2'), (2, 'v3')):
+        db.session.execute(db.update(Review).where(Review.id == review)
+                           .values(content=content, updated_at=second.replace(microsecond=microsecond)))
+        db.session.commit()
+        response = client.get(f'/api/review/{review}', headers=admin_headers)
+        assert response.get_json()['content'] == content
+        etags.append(response.headers['ETag'])
+    assert etags[0] != etags[1]
+
+
+@pytest.mark.parametrize('model', [Review, User, Role])
+def test_updated_at_keeps_microseconds_on_mysql(model):
+    ddl = str(CreateTable(model.__table__).compile(dialect=mysql.dialect()))
+    assert 'updated_at DATETIME(6) NOT NULL' in ddl
+
+
+def test_review_body_follows_author_rename_elsewhere(client, admin_headers, review):
+    client.get(f'/api/review/{review}', headers=admin_headers)
+    write_elsewhere(User, 2, username='renamed')
+    assert client.get(f'/api/review/{review}', headers=admin_headers).get_json()['user']['username'] == 'renamed'
+
+
+def test_user_and_role_bodies_follow_role_rename_elsewhere(client, admin_headers):
+    assert client.get('/api/users/2', headers=admin_headers).get_json()['roles'][0]['name'] == 'User'
+    assert 'User' in client.get('/api/roles/', headers=admin_headers).get_data(as_text=True)
+    assert client.get('/api/roles/2', headers=admin_headers).get_json()['name'] == 'User'
+
+    write_elsewhere(Role, 2, name='Member')
+    assert client.get('/api/users/2', headers=admin_headers).get_json()['roles'][0]['name'] == 'Member'
+    assert 'Member' in client.get('/api/roles/', headers=admin_headers).get_data(as_text=True)
+    assert client.get('/api/roles/2', headers=admin_headers).get_json()['name'] == 'Member'
+
+
+def test_user_list_follows_role_rename_elsewhere(client, admin_headers):
+    first = client.get('/api/users/', headers=admin_headers)
+    assert first.get_json()['users'][1]['roles'][0]['name'] == 'User'
+
+    write_elsewhere(Role, 2, name='Member')
+    second = client.get('/api/users/', headers=admin_headers)
+    assert second.headers['ETag'] != first.headers['ETag']
+    assert second.get_json()['users'][1]['roles'][0]['name'] == 'Member'
+    revalidated = client.get('/api/users/', headers={**admin_headers, 'If-None-Match': second.headers['ETag']})
+    assert revalidated.status_code == 304
+
+
+@pytest.mark.parametrize('path', ['/api/review/', '/api/users/', '/api/users/2/reviews', '/api/roles/'])
+def test_lists_have_no_last_modified(client, admin_headers, review, path):
+    response = client.get(path, headers=admin_headers)
+    assert response.status_code == 200
+    assert response.headers['ETag']
+    assert 'Last-Modified' not in response.headers
+
+
+def test_review_list_changes_after_delete(client, admin_headers):
+    for content in ('a', 'b', 'c'):
+        client.post('/api/review/', json={'content': content, 'user_id': 2}, headers=admin_headers)
+    first = client.get('/api/review/', headers=admin_headers)
+    assert client.delete('/api/review/3', headers=admin_headers).status_code == 200
+
+    since = {'If-Modified-Since': 'Fri, 01 Jan 2100 00:00:00 GMT'}
+    assert client.get('/api/review/', headers={**admin_headers, **since}).status_code == 200
+    stale = {'If-None-Match': first.headers['ETag']}
+    response = client.get('/api/review/', headers={**admin_headers, **stale})
+    assert response.status_code == 200
+    assert [review['id'] for review in response.get_json()['reviews']] == [1, 2]
+
+
+def test_role_list_changes_after_delete(client, admin_headers):
+    role_id = client.post('/api/roles/', json={'name': 'Temp'}, headers=admin_headers).get_json()['role']['id']
+    first = client.get('/api/roles/', headers=admin_headers)
+    assert client.delete(f'/api/roles/{role_id}', headers=admin_headers).status_code == 200
+
+    response = client.get('/api/roles/', headers={**admin_headers, 'If-None-Match': first.headers['ETag']})
+    assert response.status_code == 200
+    assert 'Temp' not in response.get_data(as_text=True)
@@ -0,0 +1,42 @@
+import pytest
+from app import db
+from app.models.reviewModel import Review
+from app.utils.index_audit import audit_indexes_command
+
+
+@pytest.fixture
+def reviews(app):
+    db.session.execute(db.insert(Review), [{'content': f'review {i}', 'user_id': 1 + i % 2, 'rating': 3} for i in range(50)])
+    db.session.commit()
+
+
+def audit(app):
+    return app.test_cli_runner().invoke(audit_indexes_command, ['--min-rows', '0'])
+
+
+def test_reviews_by_user_use_their_index(app, reviews):
+    assert 'ok    ReviewDAL.get_reviews_by_user_id' in audit(app).output
+
+
+def test_filtered_walk_of_another_index_is_a_full_scan(app, reviews):
+    db.session.execute(db.text('DROP INDEX ix_reviews_user_id_created_at_id'))
+    db.session.commit()
+    result = audit(app)
+    assert result.exit_code != 0
+    assert 'FAIL  ReviewDAL.get_reviews_by_user_id: full scan of reviews (~50 rows)' in result.output
+
+
+def test_limited_walk_without_filter_is_not_a_full_scan(app, reviews):
+    output = audit(app).output
+    assert 'ok    ReviewDAL.list_reviews\n' in output
+    assert 'ok    ReviewDAL.list_reviews(after=...)' in output
+
+
+def test_search_is_skipped_without_a_fulltext_index(app, reviews):
+    assert 'skip  ReviewDAL.search_reviews (reads the whole table by design)' in audit(app).output
+
+
+def test_bulk_user_lookups_use_the_unique_indexes(app):
+    output = audit(app).output
+    assert 'ok    UserDAL._skip_existing' in output
+    assert 'ok    UserDAL._roles_by_name' in output
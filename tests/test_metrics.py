@@ -0,0 +1,30 @@
+import pytest
+from tests.conftest import TestConfig
+
+
+class ScrapeTokenConfig(TestConfig):
+    METRICS_TOKEN = 'scrape-token'
+
+
+@pytest.fixture
+def config_class():
+    return ScrapeTokenConfig
+
+
+def test_metrics_need_an_admin_or_the_scrape_token(client, admin_headers, user_headers):
+    assert client.get('/metrics').status_code == 401
+    assert client.get('/metrics', headers={'Authorization': 'Bearer wrong-token'}).status_code == 422
+    assert client.get('/metrics', headers=user_headers).status_code == 403
+    assert client.get('/metrics', headers=admin_headers).status_code == 200
+    assert client.get('/metrics', headers={'Authorization': 'Bearer scrape-token'}).status_code == 200
+
+
+def test_unhandled_exception_is_counted_as_500(app, client):
+    def fail():
+        raise RuntimeError('boom')
+
+    app.add_url_rule('/fail', 'fail', fail)
+    with pytest.raises(RuntimeError):
+        client.get('/fail')
+    metrics = client.get('/metrics', headers={'Authorization': 'Bearer scrape-token'}).get_data(as_text=True)
+    assert 'http_requests_total{endpoint="fail",method="GET",status="500"} 1' in metrics
@@ -0,0 +1,46 @@
+from app import db
+from app.models.reviewModel import UserRatingStats
+from app.models.userRoleModel import User
+
+
+def rating_summary(client, headers, user_id):
+    response = client.get(f'/api/users/{user_id}/ratings', headers=headers)
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def add_review(client, headers, user_id, rating):
+    response = client.post('/api/review/', headers=headers, json={'content': 'x', 'user_id': user_id, 'rating': rating})
+    assert response.status_code == 201
+    return response.get_json()['review']['id']
+
+
+def test_null_rating_clears_the_rating(client, admin_headers):
+    review_id = add_review(client, admin_headers, 2, 4)
+    response = client.put(f'/api/review/{review_id}', headers=admin_headers, json={'rating': None})
+    assert response.status_code == 200
+    assert response.get_json()['review']['rating'] is None
+    summary = rating_summary(client, admin_headers, 2)
+    assert summary['count'] == 0 and summary['histogram']['4'] == 0
+
+
+def test_content_only_update_keeps_the_rating(client, admin_headers):
+    review_id = add_review(client, admin_headers, 2, 4)
+    response = client.put(f'/api/review/{review_id}', headers=admin_headers, json={'content': 'edited'})
+    assert response.get_json()['review']['rating'] == 4
+    assert rating_summary(client, admin_headers, 2)['count'] == 1
+
+
+def test_delete_user_removes_the_rating_stats(client, admin_headers):
+    # MySQL enforces user_rating_stats.user_id -> users.id; make SQLite do the same
+    with db.engine.connect() as connection:
+        connection.exec_driver_sql('PRAGMA foreign_keys=ON')
+    user = User(username='rater', email='rater@example.com', password_hash='x')
+    db.session.add(user)
+    db.session.commit()
+    review_id = add_review(client, admin_headers, user.id, 5)
+    # The stats row stays behind, zeroed, once the user's last review is gone
+    assert client.delete(f'/api/review/{review_id}', headers=admin_headers).status_code == 200
+
+    assert client.delete(f'/api/users/{user.id}', headers=admin_headers).status_code == 200
+    assert db.session.get(UserRatingStats, user.id) is None
@@ -0,0 +1,119 @@
+import pytest
+from flask_login import login_user
+from app import create_app, db
+from app.models.reviewModel import Review
+from app.models.userRoleModel import User
+from app.utils.backends import check_shared_backends
+from app.utils.cache import RedisBackend
+from app.utils.replica import read_from_primary
+from tests.conftest import LocalRedis, TestConfig, create_database
+
+
+@pytest.fixture
+def config_class(tmp_path):
+    class ReplicaConfig(TestConfig):
+        # Two SQLite files stand in for the primary and its replica
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{tmp_path / "primary.db"}'
+        SQLALCHEMY_BINDS = {'replica': f'sqlite:///{tmp_path / "replica.db"}'}
+        REPLICA_STICKY_SECONDS = 60
+    return ReplicaConfig
+
+
+@pytest.fixture
+def app(config_class):
+    # No app context around the test, so every request gets a fresh session as in production
+    app = create_app(config_class)
+    with app.app_context():
+        create_database()
+        # The replica starts as an up-to-date copy of the seeded primary
+        db.metadata.create_all(db.engines['replica'])
+        with db.engine.connect() as source, db.engines['replica'].begin() as target:
+            for table in db.metadata.sorted_tables:
+                rows = [row._asdict() for row in source.execute(table.select())]
+                if rows:
+                    target.execute(table.insert(), rows)
+    yield app
+    with app.app_context():
+        db.engine.dispose()
+        db.engines['replica'].dispose()
+    # init_app gave the shared db an (empty) metadata for the bind; later apps don't have it
+    db.metadatas.pop('replica', None)
+
+
+@pytest.fixture
+def engines(app):
+    with app.app_context():
+        return db.engine, db.engines['replica']
+
+
+def count_reviews(engine):
+    with engine.connect() as connection:
+        return connection.scalar(db.select(db.func.count()).select_from(Review))
+
+
+def test_get_reads_from_the_replica(client, admin_headers, engines, count_statements):
+    primary, replica = engines
+    with count_statements(primary) as primary_statements, count_statements(replica) as replica_statements:
+        response = client.get('/api/users/', headers=admin_headers)
+    assert response.status_code == 200
+    assert any('FROM users' in statement for statement in replica_statements)
+    assert not any('FROM users' in statement for statement in primary_statements)
+
+
+def test_writes_go_to_the_primary(client, admin_headers, engines):
+    primary, replica = engines
+    response = client.post('/api/review/', headers=admin_headers, json={'content': 'new', 'user_id': 2, 'rating': 4})
+    assert response.status_code == 201
+    assert count_reviews(primary) == 1
+    assert count_reviews(replica) == 0
+
+
+def test_writer_reads_own_writes_from_the_primary(client, admin_headers, user_headers, engines, count_statements):
+    _, replica = engines
+    client.post('/api/review/', headers=admin_headers, json={'content': 'new', 'user_id': 2, 'rating': 4})
+    with count_statements(replica) as replica_statements:
+        response = client.get('/api/review/', headers=admin_headers)
+    assert [review['content'] for review in response.get_json()['reviews']] == ['new']
+    assert not replica_statements
+
+    # Everyone else keeps reading the (lagging) replica
+    with count_statements(replica) as replica_statements:
+        assert client.get('/api/users/', headers=user_headers).status_code == 200
+    assert replica_statements
+
+
+def test_read_from_primary_overrides_the_replica(app, engines, count_statements):
+    _, replica = engines
+    query = db.select(db.func.count()).select_from(Review)
+    with app.test_request_context('/', method='GET'):
+        with count_statements(replica) as replica_statements:
+            db.session.scalar(query)
+        assert replica_statements
+        with count_statements(replica) as replica_statements, read_from_primary():
+            db.session.scalar(query)
+        assert not replica_statements
+
+
+def test_sticky_writer_is_shared_between_workers(app):
+    with app.app_context():
+        admin = db.session.get(User, 1)
+    router = app.extensions['replica_router']
+    shared = LocalRedis()
+    router.backend = RedisBackend(shared, prefix='ratings:sticky:')
+    with app.test_request_context('/', method='POST'):
+        login_user(admin)
+        router.record_write()
+        router._remember_writer(None)
+    assert 'ratings:sticky:1' in shared.values
+
+    # Another worker: its own router, the same redis
+    other = type(router)(RedisBackend(shared, prefix='ratings:sticky:'))
+    other.enabled = True
+    with app.test_request_context('/', method='GET'):
+        login_user(admin)
+        assert not other.allows_replica()
+
+
+def test_memory_sticky_backend_is_refused_with_several_workers(app):
+    with pytest.raises(RuntimeError, match='REPLICA_STICKY_BACKEND'):
+        check_shared_backends(app, 2)
@@ -0,0 +1,54 @@
+import pytest
+from app import db
+from app.DAL.review_Dal import ReviewDAL
+from app.models.reviewModel import Review
+from app.models.userRoleModel import User
+
+AUTHORS = 40
+REVIEWS = 1000
+
+
+@pytest.fixture
+def reviews(app):
+    db.session.execute(db.insert(User), [
+        {'username': f'author{i}', 'email': f'author{i}@example.com', 'password_hash': 'x'} for i in range(AUTHORS)
+    ])
+    author_ids = db.session.scalars(db.select(User.id)).all()
+    db.session.execute(db.insert(Review), [
+        {'content': f'review {i}', 'user_id': author_ids[i % len(author_ids)], 'rating': i % 5 + 1}
+        for i in range(REVIEWS)
+    ])
+    db.session.commit()
+    db.session.expunge_all()
+    return author_ids
+
+
+def test_list_reviews_serializes_with_one_query(reviews, count_statements):
+    with count_statements() as statements:
+        page, _ = ReviewDAL.list_reviews(REVIEWS)
+        serialized = [review.to_dict() for review in page]
+    assert len(serialized) == REVIEWS
+    assert len({review['user']['id'] for review in serialized}) == len(reviews)
+    assert len(statements) == 1
+
+
+def test_reviews_by_user_serialize_with_one_query(reviews, count_statements):
+    with count_statements() as statements:
+        page, _ = ReviewDAL.get_reviews_by_user_id(reviews[0], REVIEWS)
+        serialized = [review.to_dict() for review in page]
+    assert serialized and all(review['user']['id'] == reviews[0] for review in serialized)
+    assert len(statements) == 1
+
+
+def test_review_list_endpoint_query_count_is_fixed(app, client, admin_headers, reviews, count_statements):
+    app.config['PAGINATION_MAX_LIMIT'] = REVIEWS
+
+    def list_statements(limit):
+        with count_statements() as statements:
+            response = client.get(f'/api/review/?limit={limit}', headers=admin_headers)
+        assert response.status_code == 200
+        assert len(response.get_json()['reviews']) == limit
+        return len(statements)
+
+    list_statements(10)  # warm the identity and role caches
+    assert list_statements(REVIEWS) == list_statements(10)
@@ -0,0 +1,99 @@
+import time
+import pytest
+from app.utils.backends import check_shared_backends
+from app.utils.token_blocklist import ExpiringMemoryBackend, TokenBlocklist
+from tests.conftest import TestConfig, login
+
+
+class SmallBlocklistConfig(TestConfig):
+    JWT_BLOCKLIST_MAX_ENTRIES = 1
+    JWT_BLOCKLIST_MAX_PER_USER = 1
+
+
+@pytest.fixture
+def config_class():
+    return SmallBlocklistConfig
+
+
+def test_full_store_keeps_live_entries():
+    backend = ExpiringMemoryBackend(2)
+    assert backend.set('a', True, 60) and backend.set('b', True, 60)
+    assert backend.set('c', True, 60) is False
+    assert backend.get('a') and backend.get('b') and backend.get('c') is None
+
+
+def test_full_store_makes_room_by_dropping_expired_entries():
+    backend = ExpiringMemoryBackend(2)
+    backend.set('a', True, 0.01)
+    backend.set('b', True, 60)
+    time.sleep(0.02)
+    assert backend.set('c', True, 60)
+    assert backend.get('b') and backend.get('c')
+
+
+def test_dropped_revocation_refuses_tokens_issued_before_it():
+    blocklist = TokenBlocklist(ExpiringMemoryBackend(1))
+    now = time.time()
+    blocklist.revoke('a', now + 60)
+    blocklist.revoke('b', now + 60)
+    assert blocklist.is_revoked('a', now - 10)
+    assert blocklist.is_revoked('b', now - 10)
+    assert blocklist.is_revoked('other', now - 10)
+    assert not blocklist.is_revoked('later', now + 10)
+
+
+def test_full_store_is_logged(caplog):
+    blocklist = TokenBlocklist(ExpiringMemoryBackend(1))
+    blocklist.revoke('a', time.time() + 60)
+    blocklist.revoke('b', time.time() + 60)
+    assert 'Token blocklist is full (1 entries)' in caplog.text
+
+
+def test_user_past_their_quota_only_logs_themselves_out(caplog):
+    blocklist = TokenBlocklist(ExpiringMemoryBackend(10), max_per_user=2)
+    now = time.time()
+    for jti in ('a', 'b', 'c'):
+        blocklist.revoke(jti, now + 60, user_id=1)
+    assert 'User 1 has 2 live revoked tokens' in caplog.text
+    assert len(blocklist.backend._entries) == 2
+    assert blocklist.is_revoked('c', now - 10, user_id=1)
+    assert blocklist.is_revoked('other', now - 10, user_id=1)
+    assert not blocklist.is_revoked('later', now + 10, user_id=1)
+    assert not blocklist.is_revoked('other', now - 10, user_id=2)
+    blocklist.revoke('d', now + 60, user_id=2)
+    assert blocklist.is_revoked('d', now - 10, user_id=2)
+
+
+def test_quota_frees_up_as_revocations_expire():
+    blocklist = TokenBlocklist(ExpiringMemoryBackend(10), max_per_user=1)
+    now = time.time()
+    blocklist.revoke('a', now + 0.01, user_id=1)
+    time.sleep(0.02)
+    blocklist.revoke('b', now + 60, user_id=1)
+    assert blocklist.backend.get('b')
+    assert not blocklist.is_revoked('other', now - 10, user_id=1)
+
+
+def test_repeated_logouts_of_one_user_leave_others_logged_in(client):
+    admin = login(client, 'admin@example.com', 'adminpassword')
+    first = login(client, 'user@example.com', 'userpassword')
+    second = login(client, 'user@example.com', 'userpassword')
+    assert client.post('/api/auth/logout', headers=first).status_code == 200
+    # Over JWT_BLOCKLIST_MAX_PER_USER: the store keeps its last slot and the user's tokens are refused
+    assert client.post('/api/auth/logout', headers=second).status_code == 200
+    assert client.get('/api/review/', headers=second).status_code == 401
+    assert client.get('/api/review/', headers=admin).status_code == 200
+
+
+def test_logged_out_token_stays_revoked_when_the_store_is_full(client):
+    first = login(client, 'admin@example.com', 'adminpassword')
+    second = login(client, 'user@example.com', 'userpassword')
+    assert client.post('/api/auth/logout', headers=first).status_code == 200
+    assert client.post('/api/auth/logout', headers=second).status_code == 200
+    assert client.get('/api/review/', headers=first).status_code == 401
+    assert client.get('/api/review/', headers=second).status_code == 401
+
+
+def test_memory_backend_is_refused_with_several_workers(app):
+    with pytest.raises(RuntimeError, match='JWT_BLOCKLIST_BACKEND'):
+        check_shared_backends(app, 2)
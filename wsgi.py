@@ -0,0 +1,21 @@
+"""
+Production WSGI entry point: gunicorn -c gunicorn.conf.py (or uwsgi --ini uwsgi.ini).
+app.py is for local development with the Flask debug server.
+"""
+from app import create_app
+from app.utils.backends import check_shared_backends
+from app.utils.db_pool import dispose_engines
+
+app = create_app()
+
+try:
+    import uwsgi
+    from uwsgidecorators import postfork
+except ImportError:  # not running under uWSGI
+    pass
+else:
+    check_shared_backends(app, uwsgi.numproc)
+
+    @postfork
+    def reset_engines_after_fork():
+        dispose_engines(app, close=False)